@@ -0,0 +1,208 @@
+"""
+DataFrame backends, build frames from api records and write them with pandas or polars.
+
+Example Usage:
+
+```python
+from redutils.api.backends import get_backend
+
+frames = get_backend("polars")
+df = frames.project(records, ("Id", "EntityKey_EntitySetName"))
+frames.write(df, Path("workers.parquet"), "parquet")
+```
+"""
+
+import json
+
+from pathlib import Path
+from typing import Any, Dict, List, Sequence, Tuple
+
+# either library may be missing, a backend is only usable when its library is installed
+try:
+    import pandas as pd
+except ImportError:
+    pd = None
+
+try:
+    import polars as pl
+except ImportError:
+    pl = None
+
+from ..red import Exit, LEVEL_CRITICAL
+from .flatten import compile_headers
+
+
+class PandasBackend:
+    """frames as ``pandas.DataFrame``, projected with ``HeaderFlattener``"""
+
+    name = "pandas"
+
+    def project(self, records: List[Dict[str, Any]], headers: Tuple[str, ...]) -> Any:
+        """flattens records into a frame with exactly the columns of ``headers``, missing values as ``NaN``
+
+        :param records: (List[Dict[str, Any]]) - records as returned by the api
+        :param headers: (Tuple[str, ...]) - flattened column names
+
+        :return: DataFrame
+        """
+        flattener = compile_headers(tuple(headers))
+        return pd.DataFrame(flattener.columns(records), columns=list(headers))
+
+    def concat(self, frames: Sequence[Any]) -> Any:
+        return pd.concat(frames)
+
+    def write(
+        self, df: Any, path: Path, save_format: str, compression: str = "snappy"
+    ) -> None:
+        """writes a whole frame to a csv or parquet file
+
+        :param df: (DataFrame) - frame to write
+        :param path: (Path) - output file
+        :param save_format: (str) - ``csv`` or ``parquet``
+        :param compression: (str) - parquet compression codec, defaults to ``snappy``
+        """
+        match save_format:
+            case "csv":
+                df.to_csv(path, index=False, header=True)
+            case "parquet":
+                df.to_parquet(
+                    path, index=False, engine="pyarrow", compression=compression
+                )
+            case _:
+                Exit(LEVEL_CRITICAL, "Unknown save format")
+
+
+class PolarsBackend:
+    """frames as ``polars.DataFrame``
+
+    Columns are pulled from records with ``HeaderFlattener`` and handed to polars as whole series,
+    missing values as null, which is several times faster than loading every record with
+    ``polars.from_dicts`` and projecting struct fields. Writing uses the multithreaded polars writers.
+    """
+
+    name = "polars"
+
+    def project(self, records: List[Dict[str, Any]], headers: Tuple[str, ...]) -> Any:
+        """flattens records into a frame with exactly the columns of ``headers``, missing values as null
+
+        A column mixing integers and floats is a float column, a column mixing any other types, or
+        holding values polars would not keep as is, is a string column. Nested values are written to
+        it as JSON.
+
+        :param records: (List[Dict[str, Any]]) - records as returned by the api
+        :param headers: (Tuple[str, ...]) - flattened column names
+
+        :return: DataFrame
+        """
+        headers = tuple(headers)
+        if not records:
+            return pl.DataFrame(schema={header: pl.Utf8 for header in headers})
+
+        columns = compile_headers(headers).columns(records, missing=None)
+        return pl.DataFrame(
+            [self._series(header, columns[header]) for header in headers]
+        )
+
+    @staticmethod
+    def _series(name: str, values: List[Any]) -> Any:
+        # polars infers the type of a column from its values, nulling or truncating values
+        # of other types, check the types first
+        kinds = {type(value) for value in values if value is not None}
+        if kinds == {int, float}:
+            return pl.Series(name, values, dtype=pl.Float64)
+
+        if len(kinds) <= 1:
+            try:
+                series = pl.Series(name, values)
+            except (TypeError, ValueError, OverflowError):
+                pass
+            else:
+                if list not in kinds:
+                    return series
+                # lists of mixed or truncated items
+                if series.dtype != pl.Object and series.to_list() == values:
+                    return series
+
+        return pl.Series(
+            name,
+            [None if value is None else _text(value) for value in values],
+            dtype=pl.Utf8,
+        )
+
+    def concat(self, frames: Sequence[Any]) -> Any:
+        return pl.concat(frames, how="vertical_relaxed")
+
+    def write(
+        self, df: Any, path: Path, save_format: str, compression: str = "snappy"
+    ) -> None:
+        """writes a whole frame to a csv or parquet file with the multithreaded polars writers
+
+        :param df: (DataFrame) - frame to write, nested columns are written to csv as JSON strings
+        :param path: (Path) - output file
+        :param save_format: (str) - ``csv`` or ``parquet``
+        :param compression: (str) - parquet compression codec, defaults to ``snappy``
+        """
+        match save_format:
+            case "csv":
+                stringify_nested(df).write_csv(path, include_header=True)
+            case "parquet":
+                df.write_parquet(path, compression=compression)
+            case _:
+                Exit(LEVEL_CRITICAL, "Unknown save format")
+
+
+BACKENDS = {"pandas": PandasBackend, "polars": PolarsBackend}
+
+
+def _text(value: Any) -> str:
+    """a value as text, nested values as JSON"""
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, default=str)
+    return str(value)
+
+
+def stringify_nested(df: Any) -> Any:
+    """list and struct columns of a polars frame as JSON strings, the polars csv writer
+    does not support nested data
+
+    :param df: (DataFrame) - polars frame
+
+    :return: DataFrame
+    """
+    nested = [name for name, dtype in df.schema.items() if dtype.is_nested()]
+    if not nested:
+        return df
+    return df.with_columns(
+        pl.Series(
+            name,
+            [None if value is None else _text(value) for value in df[name].to_list()],
+            dtype=pl.Utf8,
+        )
+        for name in nested
+    )
+
+
+def get_backend(name: str) -> PandasBackend | PolarsBackend:
+    """the backend of the given name, exits if unknown or its library is not installed
+
+    :param name: (str) - ``pandas`` or ``polars``
+
+    :return: PandasBackend | PolarsBackend
+    """
+    if name not in BACKENDS:
+        Exit(LEVEL_CRITICAL, f"Unknown dataframe backend: {name}")
+    if {"pandas": pd, "polars": pl}[name] is None:
+        Exit(LEVEL_CRITICAL, f"Dataframe backend {name} is not installed")
+    return BACKENDS[name]()
+
+
+def concat_frames(frames: Sequence[Any]) -> Any:
+    """concatenates frames of either library, in order
+
+    :param frames: (Sequence[DataFrame]) - pandas or polars frames, all of the same library
+
+    :return: DataFrame
+    """
+    if pl is not None and isinstance(frames[0], pl.DataFrame):
+        return PolarsBackend().concat(frames)
+    return PandasBackend().concat(frames)
@@ -0,0 +1,151 @@
+"""
+Segmented checkpoints for resumable, paged extraction.
+
+Each page is written as its own Arrow IPC segment next to a small JSON manifest that
+holds the link to resume from and the running counts. Resuming only needs the manifest,
+earlier pages are read back one segment at a time, and only if asked for.
+
+Example Usage:
+
+```python
+from redutils.api.checkpoint import SegmentCheckpoint
+
+checkpoint = SegmentCheckpoint("https://example/api/workers?$skip=0")
+
+if checkpoint.exists():
+    manifest = checkpoint.load()
+    url = manifest["next_link"]
+
+for records, url in pages(url):
+    checkpoint.save(records, next_link=url)
+
+checkpoint.clear()
+```
+"""
+
+import hashlib
+import json
+import os
+import shutil
+
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+import pyarrow as pa
+import pyarrow.ipc as ipc
+
+
+class SegmentCheckpoint:
+    """
+    A directory of per-page Arrow IPC segments with a JSON manifest, named after the hash of a key
+    (usually the prepared url).
+
+    ```
+    <root>/<sha256 of key>/
+        manifest.json       {"url": ..., "next_link": ..., "pages": 2, "records": 2000}
+        00000000.arrow
+        00000001.arrow
+    ```
+
+    Records are stored columnar when arrow can infer a schema for the page, otherwise each
+    record is stored as a JSON string in a single ``__json__`` column. Columnar pages hold every
+    key found in the page, keys missing from a record are read back as ``None``.
+
+    :param key: (str) - unique key of the checkpoint, i.e. the prepared url
+    :param root: (Path) - directory that holds the checkpoint, defaults to the working directory
+    :param compression: (str|None) - arrow IPC compression for segments, ``lz4``, ``zstd`` or ``None``
+    """
+
+    MANIFEST = "manifest.json"
+    JSON_COLUMN = "__json__"
+
+    def __init__(
+        self, key: str, root: Path = Path("."), compression: Optional[str] = "lz4"
+    ) -> None:
+        self.key = key
+        self.path = Path(root) / hashlib.sha256(key.encode()).hexdigest()
+        self._options = ipc.IpcWriteOptions(compression=compression)
+        self._manifest: Dict[str, Any] = {
+            "url": key,
+            "next_link": None,
+            "pages": 0,
+            "records": 0,
+        }
+
+    @property
+    def manifest(self) -> Dict[str, Any]:
+        return self._manifest
+
+    def exists(self) -> bool:
+        """checks if a manifest was written for this checkpoint"""
+        return (self.path / self.MANIFEST).is_file()
+
+    def load(self) -> Dict[str, Any]:
+        """reads the manifest of an existing checkpoint, segments are left on disk
+
+        :return: (Dict[str, Any]) - the manifest
+        """
+        with open(self.path / self.MANIFEST, "r") as f:
+            self._manifest = json.load(f)
+        return self._manifest
+
+    def save(
+        self, records: List[Dict[str, Any]], next_link: Optional[str], **extra: Any
+    ) -> None:
+        """writes a page as a new segment, then updates the manifest
+
+        The manifest is replaced atomically after the segment is written, a crash in between
+        leaves an orphaned segment that is never read back.
+
+        :param records: (List[Dict[str, Any]]) - records of the page
+        :param next_link: (str|None) - link to resume from after this page
+        :param extra: (Any) - additional JSON serializable values to keep in the manifest
+        """
+        self.path.mkdir(parents=True, exist_ok=True)
+
+        page = self._manifest["pages"]
+        table = self._to_table(records)
+        with ipc.new_file(
+            self.path / f"{page:08d}.arrow", table.schema, options=self._options
+        ) as writer:
+            writer.write_table(table)
+
+        self._manifest.update(extra)
+        self._manifest["next_link"] = next_link
+        self._manifest["pages"] = page + 1
+        self._manifest["records"] += len(records)
+
+        tmp = self.path / f"{self.MANIFEST}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(self._manifest, f)
+        os.replace(tmp, self.path / self.MANIFEST)
+
+    def segments(self) -> Iterator[List[Dict[str, Any]]]:
+        """reads back the saved pages in order, one segment at a time
+
+        :return: generator of pages, each page is a list of records
+        """
+        for page in range(self._manifest["pages"]):
+            with ipc.open_file(self.path / f"{page:08d}.arrow") as reader:
+                table = reader.read_all()
+
+            if table.column_names == [self.JSON_COLUMN]:
+                yield [json.loads(r) for r in table.column(0).to_pylist()]
+            else:
+                yield table.to_pylist()
+
+    def clear(self) -> None:
+        """removes the checkpoint from disk"""
+        if self.path.is_dir():
+            shutil.rmtree(self.path, ignore_errors=True)
+
+        self._manifest.update({"next_link": None, "pages": 0, "records": 0})
+
+    def _to_table(self, records: List[Dict[str, Any]]) -> pa.Table:
+        # columns of every key found in the page, ``from_pylist`` only takes those of the first record
+        keys = dict.fromkeys(key for record in records for key in record)
+        try:
+            return pa.table({key: [r.get(key) for r in records] for key in keys})
+        except (pa.ArrowException, TypeError, ValueError):
+            # mixed types within a field, fall back to raw json
+            return pa.table({self.JSON_COLUMN: [json.dumps(r) for r in records]})
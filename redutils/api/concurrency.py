@@ -0,0 +1,264 @@
+"""
+Adaptive concurrency for parallel api callers
+"""
+
+import asyncio
+import threading
+import time
+
+from collections import deque
+from typing import Deque, Dict, Optional, Tuple
+
+from ..red import Red
+
+
+class AdaptiveConcurrency:
+    """
+    AIMD (additive increase, multiplicative decrease) limit on the requests in flight.
+
+    The limit grows by ``increase`` after each window of ``limit`` healthy responses, and is
+    multiplied by ``decrease`` on an overload signal: a throttled or unavailable response, a
+    connection error or timeout, or a latency above ``latency_tolerance`` times the baseline
+    (the lowest smoothed latency seen, slowly drifting up). Only requests started after the
+    last decrease can trigger the next one, so a burst of failures backs off once.
+
+    One controller is meant to be shared by every caller of a source, threads and asyncio tasks
+    alike. ``OAuthApi``, ``AsyncOAuthApi`` and ``GenericToken`` hold a slot of the controller set
+    as their ``concurrency`` class attribute for every call, so every instance of a source class
+    shares it. Pools feeding it should be sized to ``max_limit``, the controller decides how many
+    of their workers may call at once.
+
+    Example Usage:
+
+    ```python
+    from redutils.api.concurrency import AdaptiveConcurrency
+
+    class Workers(BaseEntity):
+        __entity_name__ = "Workers"
+        concurrency = AdaptiveConcurrency(initial=4, max_limit=16)
+
+    # in threads
+    with Workers.concurrency.slot() as slot:
+        resp = session.get(url)
+        slot.status = resp.status_code
+
+    # in asyncio tasks
+    async with Workers.concurrency.slot() as slot:
+        resp = await session.get(url)
+        slot.status = resp.status
+
+    print(Workers.concurrency.stats)
+    ```
+
+    :param initial: (int) - limit to start with, defaults to 4
+    :param min_limit: (int) - lowest limit, defaults to 1
+    :param max_limit: (int) - highest limit, defaults to 64
+    :param increase: (int) - added to the limit after a healthy window, defaults to 1
+    :param decrease: (float) - factor applied to the limit on overload, defaults to 0.5
+    :param latency_tolerance: (float) - latency over baseline ratio considered a spike, defaults to 2
+    :param statuses: (Tuple[int, ...]) - response statuses signaling overload, defaults to 429, 503 and 504
+    :param throughput_window: (float) - seconds of completed requests the throughput is measured over, defaults to 10
+    :param poll_interval: (float) - seconds between checks of a free slot in asyncio tasks, defaults to 0.01
+
+    :raises: ValueError - if the limits or the decrease are out of range
+    """
+
+    def __init__(
+        self,
+        initial: int = 4,
+        min_limit: int = 1,
+        max_limit: int = 64,
+        increase: int = 1,
+        decrease: float = 0.5,
+        latency_tolerance: float = 2.0,
+        statuses: Tuple[int, ...] = (429, 503, 504),
+        throughput_window: float = 10.0,
+        poll_interval: float = 0.01,
+    ) -> None:
+        if not 1 <= min_limit <= initial <= max_limit:
+            raise ValueError(
+                "Concurrency limits must satisfy 1 <= min <= initial <= max"
+            )
+        if not 0 < decrease < 1:
+            raise ValueError("Concurrency decrease must be between 0 and 1")
+
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.increase = increase
+        self.decrease = decrease
+        self.latency_tolerance = latency_tolerance
+        self.statuses = statuses
+        self.throughput_window = throughput_window
+        self.poll_interval = poll_interval
+
+        self._cond = threading.Condition()
+        self._limit: float = float(initial)
+        self._in_flight = 0
+        self._healthy = 0
+        self._last_decrease: float = 0.0
+        self._latency: Optional[float] = None
+        self._baseline: Optional[float] = None
+        self._completed: Deque[float] = deque()
+        self._requests = 0
+        self._overloads = 0
+
+    @property
+    def limit(self) -> int:
+        """current number of requests allowed in flight"""
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def throughput(self) -> float:
+        """completed requests per second over the throughput window"""
+        with self._cond:
+            self._trim(time.monotonic())
+            return len(self._completed) / self.throughput_window
+
+    @property
+    def stats(self) -> Dict[str, float]:
+        """limit, requests in flight, throughput and latencies of the controller"""
+        return {
+            "limit": self.limit,
+            "in_flight": self._in_flight,
+            "throughput": round(self.throughput, 3),
+            "latency": round(self._latency or 0.0, 3),
+            "baseline": round(self._baseline or 0.0, 3),
+            "requests": self._requests,
+            "overloads": self._overloads,
+        }
+
+    def slot(self) -> "_Slot":
+        """a request slot, held for the duration of a ``with`` or ``async with`` block
+
+        Set ``status`` on the slot to the response status before leaving the block, a slot left
+        by an exception before any status was set counts as an overload.
+        """
+        return slot(self)
+
+    def acquire(self) -> float:
+        """blocks the calling thread until a slot is free
+
+        :return: (float) - start time of the request, to pass to ``release``
+        """
+        with self._cond:
+            while self._in_flight >= self.limit:
+                self._cond.wait()
+            self._in_flight += 1
+        return time.monotonic()
+
+    async def acquire_async(self) -> float:
+        """waits, without blocking the event loop, until a slot is free
+
+        :return: (float) - start time of the request, to pass to ``release``
+        """
+        while True:
+            with self._cond:
+                if self._in_flight < self.limit:
+                    self._in_flight += 1
+                    return time.monotonic()
+            # the slots are shared with threads, poll instead of blocking the loop
+            await asyncio.sleep(self.poll_interval)
+
+    def release(
+        self, started: float, status: Optional[int] = None, failed: bool = False
+    ) -> None:
+        """frees a slot and adjusts the limit to the outcome of the request
+
+        :param started: (float) - value returned by ``acquire``
+        :param status: (int|None) - response status, if any
+        :param failed: (bool) - the request failed without a response, i.e. a connection error or timeout
+        """
+        now = time.monotonic()
+        latency = now - started
+
+        with self._cond:
+            self._in_flight -= 1
+            self._requests += 1
+            self._completed.append(now)
+            self._trim(now)
+
+            spike = self._observe(latency)
+            if failed or status in self.statuses or spike:
+                # requests started before the last decrease saw the old limit
+                if started >= self._last_decrease:
+                    self._back_off(now, status, spike)
+            else:
+                self._healthy += 1
+                if self._healthy >= self.limit and self._limit < self.max_limit:
+                    self._limit = min(self._limit + self.increase, self.max_limit)
+                    self._healthy = 0
+
+            self._cond.notify_all()
+
+    def _observe(self, latency: float) -> bool:
+        if self._latency is None:
+            self._latency = self._baseline = latency
+            return False
+
+        self._latency += 0.2 * (latency - self._latency)
+        if self._latency < self._baseline:
+            self._baseline = self._latency
+        else:
+            # let the baseline follow a lasting change of the endpoint
+            self._baseline += 0.01 * (self._latency - self._baseline)
+
+        return self._latency > self.latency_tolerance * self._baseline
+
+    def _back_off(self, now: float, status: Optional[int], spike: bool) -> None:
+        limit = max(self._limit * self.decrease, self.min_limit)
+        self._overloads += 1
+        self._healthy = 0
+        self._last_decrease = now
+        if int(limit) != self.limit:
+            reason = "latency spike" if spike else f"status {status}"
+            Red.debug(f"Concurrency limit {self.limit} -> {int(limit)} on {reason}")
+        self._limit = limit
+
+    def _trim(self, now: float) -> None:
+        while self._completed and now - self._completed[0] > self.throughput_window:
+            self._completed.popleft()
+
+
+class _Slot:
+    """a held request slot of an ``AdaptiveConcurrency``, a no-op without a controller"""
+
+    def __init__(self, controller: Optional[AdaptiveConcurrency]) -> None:
+        self._controller = controller
+        self._started: float = 0.0
+        self.status: Optional[int] = None
+
+    def __enter__(self) -> "_Slot":
+        if self._controller is not None:
+            self._started = self._controller.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if self._controller is not None:
+            # an exception raised after a response was received is judged by its status
+            self._controller.release(
+                self._started,
+                self.status,
+                failed=exc_type is not None and self.status is None,
+            )
+
+    async def __aenter__(self) -> "_Slot":
+        if self._controller is not None:
+            self._started = await self._controller.acquire_async()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        self.__exit__(exc_type, exc_value, traceback)
+
+
+def slot(controller: Optional[AdaptiveConcurrency]) -> _Slot:
+    """a request slot of the controller, or a no-op slot when there is no controller
+
+    :param controller: (AdaptiveConcurrency|None) - controller to hold a slot of
+
+    :return: _Slot
+    """
+    return _Slot(controller)
@@ -0,0 +1,139 @@
+"""
+Header driven flattening of nested records, a targeted replacement for ``pd.json_normalize``
+when only a known set of flattened columns is kept.
+"""
+
+import math
+
+from functools import lru_cache
+from itertools import combinations
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+
+class HeaderFlattener:
+    """
+    Pulls only the values of the given headers out of nested records, column by column.
+
+    A header such as ``EntityKey_EntitySetName`` names the same value ``pd.json_normalize(records, sep="_")``
+    would produce, i.e. ``record["EntityKey"]["EntitySetName"]``. As keys may themselves contain the
+    separator, every possible key path of a header is tried until one resolves, the path that
+    resolved is then tried first for the following records.
+
+    Missing values, and headers that resolve to a nested object, are filled with ``NaN``, the same
+    as normalizing every key and reindexing on the headers.
+
+    Example Usage:
+
+    ```python
+    from redutils.api.flatten import compile_headers
+
+    flattener = compile_headers(("Id", "EntityKey_EntitySetName"))
+
+    records = [{"Id": 1, "EntityKey": {"EntitySetName": "Clients"}, "Extra": True}]
+    flattener.columns(records)
+    # {"Id": [1], "EntityKey_EntitySetName": ["Clients"]}
+    flattener.unknown(records)
+    # {"Extra"}
+    ```
+
+    :param headers: (Tuple[str, ...]) - flattened column names to pull from records
+    :param sep: (str) - separator used to join nested keys, defaults to ``_``
+    """
+
+    def __init__(self, headers: Tuple[str, ...], sep: str = "_") -> None:
+        self.headers = tuple(headers)
+        self.sep = sep
+        self._candidates: List[Tuple[Tuple[str, ...], ...]] = [
+            tuple(self._key_paths(header)) for header in self.headers
+        ]
+        self._resolved: List[Optional[Tuple[str, ...]]] = [None] * len(self.headers)
+
+    def columns(
+        self, records: List[Dict[str, Any]], missing: Any = math.nan
+    ) -> Dict[str, List[Any]]:
+        """extracts the values of every header from the records
+
+        :param records: (List[Dict[str, Any]]) - nested records
+        :param missing: (Any) - value of headers a record does not set, defaults to ``NaN``
+
+        :return: (Dict[str, List[Any]]) - a list of values per header, in header order
+        """
+        return {
+            header: [self._value(idx, record, missing) for record in records]
+            for idx, header in enumerate(self.headers)
+        }
+
+    def unknown(self, records: List[Dict[str, Any]]) -> Set[str]:
+        """flattened names present in the records that are not a header
+
+        Every record is walked, records sharing their top-level keys may still nest different ones.
+
+        :param records: (List[Dict[str, Any]]) - nested records
+
+        :return: (Set[str]) - names as ``pd.json_normalize`` would produce them
+        """
+        names: Set[str] = set()
+        for record in records:
+            names.update(self._flat_names(record, ""))
+
+        return names.difference(self.headers)
+
+    def _value(self, idx: int, record: Dict[str, Any], missing: Any) -> Any:
+        resolved = self._resolved[idx]
+        if resolved is not None:
+            found, value = self._get(record, resolved)
+            if found:
+                return value
+
+        for path in self._candidates[idx]:
+            if path is resolved:
+                continue
+            found, value = self._get(record, path)
+            if found:
+                self._resolved[idx] = path
+                return value
+
+        return missing
+
+    def _flat_names(self, record: Dict[str, Any], prefix: str) -> Iterator[str]:
+        for key, value in record.items():
+            name = f"{prefix}{self.sep}{key}" if prefix else str(key)
+            if isinstance(value, dict):
+                yield from self._flat_names(value, name)
+            else:
+                yield name
+
+    def _key_paths(self, header: str) -> Iterator[Tuple[str, ...]]:
+        # every way of splitting the header on the separator, the whole header first
+        parts = header.split(self.sep)
+        for cuts in range(len(parts)):
+            for positions in combinations(range(1, len(parts)), cuts):
+                bounds = (0, *positions, len(parts))
+                yield tuple(
+                    self.sep.join(parts[start:end])
+                    for start, end in zip(bounds, bounds[1:])
+                )
+
+    @staticmethod
+    def _get(record: Any, path: Tuple[str, ...]) -> Tuple[bool, Any]:
+        for key in path:
+            if not isinstance(record, dict) or key not in record:
+                return False, None
+            record = record[key]
+
+        if isinstance(record, dict):
+            # json_normalize would flatten this further, the header is not set
+            return False, None
+        return True, record
+
+
+@lru_cache(maxsize=None)
+def compile_headers(headers: Tuple[str, ...], sep: str = "_") -> HeaderFlattener:
+    """compiles, once, a flattener for the given headers
+
+    :param headers: (Tuple[str, ...]) - flattened column names to pull from records
+    :param sep: (str) - separator used to join nested keys, defaults to ``_``
+
+    :return: HeaderFlattener
+    """
+    return HeaderFlattener(headers, sep=sep)
@@ -1,8 +1,14 @@
 """ OData logic and helper classes"""
 
-from typing import Dict
+import re
+from typing import Any, Dict, List, Optional, Tuple
 import urllib
 
+_GUID = re.compile(r"[0-9a-fA-F]{8}-([0-9a-fA-F]{4}-){3}[0-9a-fA-F]{12}")
+_DATE = re.compile(
+    r"\d{4}-\d{2}-\d{2}(T\d{2}:\d{2}(:\d{2}(\.\d+)?)?(Z|[+-]\d{2}:\d{2})?)?"
+)
+
 
 class ODataUrl:
     """
@@ -63,3 +69,104 @@ class ODataUrl:
         url = str(urllib.parse.urljoin(self.base_url, uri))  # type: ignore
         url += "/$count"
         return url
+
+    @staticmethod
+    def select(
+        headers: Tuple[str, ...],
+        expand: Tuple[str, ...] = (),
+        complex_types: Tuple[str, ...] = (),
+        sep: str = "_",
+    ) -> Dict[str, str]:
+        """helper function to build ``$select`` and ``$expand`` params from flattened headers
+
+        Headers are selected as is, property names may contain ``sep``. Only a header starting with a
+        property listed in ``complex_types`` or ``expand`` followed by ``sep`` is nested:
+        ``EntityKey_EntitySetName`` selects ``EntityKey`` when ``EntityKey`` is a complex type.
+        Properties listed in ``expand`` are navigation properties, they are expanded with a nested
+        ``$select`` of the property following them instead.
+
+        ```python
+        ODataUrl.select(
+            ("Id", "Custom_Field", "EntityKey_EntitySetName", "Owner_Name"),
+            expand=("Owner",),
+            complex_types=("EntityKey",),
+        )
+        # {"$select": "Id,Custom_Field,EntityKey", "$expand": "Owner($select=Name)"}
+        ```
+
+        :param headers: (Tuple[str, ...]) - flattened headers, as produced by ``pd.json_normalize(sep=sep)``
+        :param expand: (Tuple[str, ...]) - navigation properties to expand
+        :param complex_types: (Tuple[str, ...]) - properties of a complex type, selected whole
+        :param sep: (str) - separator of nested properties within headers
+
+        :return: Dict[str, str]
+        """
+        selected: List[str] = []
+        expanded: Dict[str, List[str]] = {}
+
+        for header in headers:
+            root, _, rest = header.partition(sep)
+            if root not in expand and root not in complex_types:
+                root = header
+
+            if root in expand:
+                fields = expanded.setdefault(root, [])
+                field = rest.partition(sep)[0]
+                if field and field not in fields:
+                    fields.append(field)
+            elif root not in selected:
+                selected.append(root)
+
+        params = {}
+        if selected:
+            params["$select"] = ",".join(selected)
+        if expanded:
+            params["$expand"] = ",".join(
+                f"{nav}($select={','.join(fields)})" if fields else nav
+                for nav, fields in expanded.items()
+            )
+        return params
+
+    @staticmethod
+    def window(field: str, start: str, end: Optional[str] = None) -> str:
+        """helper function to build the ``$filter`` of a ``[start, end)`` range of a field
+
+        ```python
+        ODataUrl.window("ModifiedOn", "2024-01-01", "2024-02-01")
+        # "ModifiedOn ge 2024-01-01 and ModifiedOn lt 2024-02-01"
+        ```
+
+        :param field: (str) - field to filter on
+        :param start: (str) - odata literal of the inclusive lower bound
+        :param end: (str|None) - odata literal of the exclusive upper bound, ``None`` leaves the range open
+
+        :return: str
+        """
+        if end is None:
+            return f"{field} ge {start}"
+        return f"{field} ge {start} and {field} lt {end}"
+
+    @staticmethod
+    def literal(value: Any) -> str:
+        """helper function to write a value from a payload as an odata literal
+
+        Numbers, booleans, dates, date times and guids are written as is, any other string is quoted.
+
+        ```python
+        ODataUrl.literal(42)  # "42"
+        ODataUrl.literal("2024-01-01T08:00:00Z")  # "2024-01-01T08:00:00Z"
+        ODataUrl.literal("O'Brien")  # "'O''Brien'"
+        ```
+
+        :param value: (Any) - value as read from a record
+
+        :return: str
+        """
+        if isinstance(value, bool):
+            return str(value).lower()
+        if isinstance(value, (int, float)):
+            return str(value)
+        value = str(value)
+        if _GUID.fullmatch(value) or _DATE.fullmatch(value):
+            return value
+        return "'" + value.replace("'", "''") + "'"
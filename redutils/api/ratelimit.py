@@ -0,0 +1,129 @@
+"""
+Client side rate limiting for api callers
+"""
+
+import asyncio
+import threading
+import time
+
+from typing import Dict, Optional
+
+
+class RateLimiter:
+    """
+    Token bucket limiting requests per second, optionally bounding the requests in flight.
+
+    One limiter is meant to be shared by every caller of a source, threads and asyncio tasks
+    alike. ``OAuthApi``, ``AsyncOAuthApi`` and ``GenericToken`` call through the limiter set as
+    their ``rate_limiter`` class attribute, so every instance of a source class shares it. Each
+    request reserves the next free slot of the bucket, so callers are served in the order they asked.
+
+    Example Usage:
+
+    ```python
+    from redutils.api.ratelimit import RateLimiter
+
+    class Workers(BaseEntity):
+        __entity_name__ = "Workers"
+        rate_limiter = RateLimiter(rate=10, burst=20, max_in_flight=8)
+
+    # in threads
+    with Workers.rate_limiter:
+        session.get(url)
+
+    # in asyncio tasks
+    async with Workers.rate_limiter:
+        await session.get(url)
+    ```
+
+    :param rate: (float) - requests per second allowed on average
+    :param burst: (int|None) - requests allowed at once after an idle period, defaults to ``rate`` rounded up
+    :param max_in_flight: (int|None) - requests allowed to run at the same time, defaults to no bound
+    :param poll_interval: (float) - seconds between checks of a free in-flight slot in asyncio tasks, defaults to 0.01
+
+    :raises: ValueError - if ``rate`` is not positive
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: Optional[int] = None,
+        max_in_flight: Optional[int] = None,
+        poll_interval: float = 0.01,
+    ) -> None:
+        if rate <= 0:
+            raise ValueError("Rate limit must be greater than 0")
+
+        self.rate = rate
+        self.burst = burst or max(1, int(-(-rate // 1)))
+        self.max_in_flight = max_in_flight
+        self.poll_interval = poll_interval
+
+        self._lock = threading.Lock()
+        self._tokens: float = float(self.burst)
+        self._updated: float = time.monotonic()
+        self._slots: Optional[threading.Semaphore] = (
+            threading.Semaphore(max_in_flight) if max_in_flight else None
+        )
+        self._requests = 0
+        self._waited = 0.0
+
+    @property
+    def stats(self) -> Dict[str, float]:
+        """requests let through and total seconds spent waiting for the bucket"""
+        return {"requests": self._requests, "waited": round(self._waited, 3)}
+
+    def reserve(self) -> float:
+        """takes a token from the bucket
+
+        :return: (float) - seconds to wait before the reserved request may start
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.burst, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            self._tokens -= 1
+            self._requests += 1
+
+            wait = max(-self._tokens / self.rate, 0.0)
+            self._waited += wait
+            return wait
+
+    def acquire(self) -> None:
+        """blocks the calling thread until a request may start"""
+        wait = self.reserve()
+        if wait:
+            time.sleep(wait)
+        if self._slots is not None:
+            self._slots.acquire()
+
+    async def acquire_async(self) -> None:
+        """waits, without blocking the event loop, until a request may start"""
+        wait = self.reserve()
+        if wait:
+            await asyncio.sleep(wait)
+        if self._slots is not None:
+            # the slots are shared with threads, poll instead of blocking the loop
+            while not self._slots.acquire(blocking=False):
+                await asyncio.sleep(self.poll_interval)
+
+    def release(self) -> None:
+        """frees the in-flight slot of a finished request"""
+        if self._slots is not None:
+            self._slots.release()
+
+    def __enter__(self) -> "RateLimiter":
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.release()
+
+    async def __aenter__(self) -> "RateLimiter":
+        await self.acquire_async()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        self.release()
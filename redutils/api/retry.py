@@ -0,0 +1,109 @@
+"""
+Retry policies for api callers
+"""
+
+import random
+import threading
+
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Optional, Tuple
+
+
+class RetryPolicy:
+    """
+    Exponential backoff with full jitter, honoring the ``Retry-After`` header of throttled
+    or unavailable responses. Retries are counted across every caller sharing the policy.
+
+    Example Usage:
+
+    ```python
+    from redutils.api.retry import RetryPolicy
+
+    policy = RetryPolicy(max_retries=3, backoff=0.5)
+
+    for attempt in range(policy.max_retries + 1):
+        resp = session.get(url)
+        if not policy.retryable(resp.status_code):
+            break
+        policy.record()
+        time.sleep(policy.delay(attempt, resp.headers.get("Retry-After")))
+
+    print(policy.retries)
+    ```
+
+    :param max_retries: (int) - retries after the first attempt, defaults to 5
+    :param backoff: (float) - seconds of the first backoff, doubled on each retry, defaults to 1
+    :param max_backoff: (float) - upper bound of a backoff, in seconds, defaults to 60
+    :param jitter: (bool) - wait a random time between 0 and the backoff, defaults to True
+    :param statuses: (Tuple[int, ...]) - response statuses worth retrying, defaults to 429 and 5xx gateway errors
+    :param max_retry_after: (float) - upper bound of a server requested ``Retry-After``, in seconds, defaults to 300
+    """
+
+    def __init__(
+        self,
+        max_retries: int = 5,
+        backoff: float = 1.0,
+        max_backoff: float = 60.0,
+        jitter: bool = True,
+        statuses: Tuple[int, ...] = (429, 500, 502, 503, 504),
+        max_retry_after: float = 300.0,
+    ) -> None:
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.statuses = statuses
+        self.max_retry_after = max_retry_after
+        self._retries = 0
+        self._lock = threading.Lock()
+
+    @property
+    def retries(self) -> int:
+        """number of retries recorded so far"""
+        return self._retries
+
+    def retryable(self, status: int) -> bool:
+        """checks if a response status is worth retrying"""
+        return status in self.statuses
+
+    def record(self) -> None:
+        """records a retry"""
+        with self._lock:
+            self._retries += 1
+
+    def delay(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """seconds to wait before the next attempt
+
+        :param attempt: (int) - zero based number of the attempt that failed
+        :param retry_after: (str|None) - value of the ``Retry-After`` header, seconds or an HTTP date
+
+        :return: float
+        """
+        requested = self._parse_retry_after(retry_after)
+        if requested is not None:
+            return min(requested, self.max_retry_after)
+
+        backoff = min(self.backoff * (2**attempt), self.max_backoff)
+        if self.jitter:
+            return random.uniform(0, backoff)
+        return backoff
+
+    @staticmethod
+    def _parse_retry_after(retry_after: Optional[str]) -> Optional[float]:
+        if not retry_after:
+            return None
+
+        try:
+            return max(float(retry_after), 0.0)
+        except ValueError:
+            pass
+
+        try:
+            when = parsedate_to_datetime(retry_after)
+        except (TypeError, ValueError):
+            return None
+
+        if when.tzinfo is None:
+            when = when.replace(tzinfo=timezone.utc)
+        return max((when - datetime.now(timezone.utc)).total_seconds(), 0.0)
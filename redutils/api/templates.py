@@ -2,7 +2,7 @@
 Dedicated to templates and design patterns
 """
 
-from typing import Callable
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Sequence, Tuple
 
 # try to import pandas, if not available, then use polars
 # if polars is not available, then raise an ImportError
@@ -18,9 +18,162 @@ except ImportError:
         )
 
 import asyncio
+import inspect
 
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
 
-class AsyncIngestionTemplate:
+from ..red import Red
+from .backends import PandasBackend, PolarsBackend, concat_frames, get_backend
+
+# marks the end of a stream of chunks between pipeline stages
+_END = object()
+
+
+def parallel_map(
+    func: Callable[[Any], Any], chunks: Iterable[Any], workers: int
+) -> Iterator[Any]:
+    """applies ``func`` to every chunk in a process pool, yielding results in the order of the chunks
+
+    At most two chunks per worker are in flight, chunks are drawn from ``chunks`` as results are yielded.
+
+    :param func: (Callable) - picklable function, i.e. defined at module level
+    :param chunks: (Iterable) - chunks to transform
+    :param workers: (int) - processes in the pool
+
+    :return: generator of transformed chunks
+    """
+    pending: deque[Future] = deque()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for chunk in chunks:
+            pending.append(pool.submit(func, chunk))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+
+        while pending:
+            yield pending.popleft().result()
+
+
+def parallel_apply(
+    func: Callable[[pd.DataFrame], pd.DataFrame],
+    df: pd.DataFrame,
+    workers: int,
+    partitions: Optional[int] = None,
+) -> pd.DataFrame:
+    """applies ``func`` to row partitions of a frame in a process pool, then reassembles them in order
+
+    :param func: (Callable) - picklable function, i.e. defined at module level
+    :param df: (DataFrame) - frame to transform
+    :param workers: (int) - processes in the pool
+    :param partitions: (int|None) - number of row partitions, defaults to ``workers``
+
+    :return: `DataFrame`_
+
+    .. _DataFrame: https://pandas.pydata.org/docs/reference/api/pandas.DataFrame.html
+    """
+    partitions = max(min(partitions or workers, len(df)), 1)
+    size = -(-len(df) // partitions)
+    parts = (df[start : start + size] for start in range(0, len(df), size or 1))
+    return concat_frames(list(parallel_map(func, parts, workers)))
+
+
+def plan_windows(start: Any, end: Any, windows: int) -> List[Tuple[Any, Any]]:
+    """splits a ``[start, end)`` range into consecutive windows of equal length
+
+    Works on anything supporting subtraction and addition of a step, i.e. ``datetime`` or ``date``.
+    Dates only move by whole days, windows that would be shorter than a day are merged.
+
+    ```python
+    plan_windows(date(2024, 1, 1), date(2024, 1, 31), 3)
+    # [(date(2024, 1, 1), date(2024, 1, 11)), (date(2024, 1, 11), date(2024, 1, 21)),
+    #  (date(2024, 1, 21), date(2024, 1, 31))]
+    ```
+
+    :param start: (Any) - inclusive start of the range
+    :param end: (Any) - exclusive end of the range
+    :param windows: (int) - number of windows to split the range into
+
+    :return: (List[Tuple[Any, Any]]) - ``(start, end)`` of every window, in order, empty for an empty range
+    """
+    if end <= start:
+        return []
+
+    step = (end - start) / max(windows, 1)
+    bounds = [start + step * idx for idx in range(max(windows, 1))] + [end]
+    # repeated bounds are windows that collapsed to nothing
+    bounds = list(dict.fromkeys(bounds))
+    return list(zip(bounds, bounds[1:]))
+
+
+class _FrameBackend:
+    """selectable dataframe library of the ingestion templates, ``pandas`` or ``polars``"""
+
+    backend: str = "pandas"
+
+    @property
+    def frames(self) -> PandasBackend | PolarsBackend:
+        """the backend building and writing frames, see ``redutils.api.backends``"""
+        return get_backend(self.backend)
+
+
+class _ParallelTransform:
+    """opt-in parallel transform of the extracted data, shared by the ingestion templates
+
+    Set ``transform_func`` to a picklable function, a module level function or a ``staticmethod``,
+    taking and returning a frame, and ``transform_workers`` to the number of processes to run it in.
+    A frame is split into ``transform_partitions`` row partitions, a stream of chunks is transformed
+    chunk by chunk, results are always reassembled in order.
+    """
+
+    transform_func: Optional[Callable[[pd.DataFrame], pd.DataFrame]] = None
+    transform_workers: int = 0
+    transform_partitions: Optional[int] = None
+
+    def _transform_func(self) -> Optional[Callable[[pd.DataFrame], pd.DataFrame]]:
+        # looked up statically, a plain function set on the class must not be bound to self
+        func = inspect.getattr_static(self, "transform_func", None)
+        if isinstance(func, staticmethod):
+            func = func.__func__
+        return func
+
+    def transform(self, df: pd.DataFrame) -> pd.DataFrame:
+        """applies ``transform_func`` to a frame, in ``transform_workers`` processes when more than one
+
+        :param df: (DataFrame) - frame to transform
+
+        :return: `DataFrame`_
+
+        .. _DataFrame: https://pandas.pydata.org/docs/reference/api/pandas.DataFrame.html
+        """
+        func = self._transform_func()
+        if func is None:
+            return df
+        if self.transform_workers <= 1 or len(df) < 2:
+            return func(df)
+
+        return parallel_apply(
+            func, df, self.transform_workers, partitions=self.transform_partitions
+        )
+
+    def transform_chunks(
+        self, chunks: Iterable[pd.DataFrame]
+    ) -> Iterator[pd.DataFrame]:
+        """applies ``transform_func`` to a stream of frames, ``transform_workers`` chunks at a time
+
+        :param chunks: (Iterable[DataFrame]) - frames to transform
+
+        :return: generator of transformed frames, in order
+        """
+        func = self._transform_func()
+        if func is None:
+            yield from chunks
+        elif self.transform_workers <= 1:
+            yield from map(func, chunks)
+        else:
+            yield from parallel_map(func, chunks, self.transform_workers)
+
+
+class AsyncIngestionTemplate(_FrameBackend, _ParallelTransform):
     """
     A template designed for repeatable ingestion pattern by providing skeleton methods that should be
     defined by designer.
@@ -51,8 +204,41 @@ class AsyncIngestionTemplate:
     ci = CustomIngestion()
     ci.run() # this will spin up the async loop and run the ingestion process
     ```
+
+    Streaming mode: define ``extract`` as an async generator of chunks and the ingestion becomes
+    a pipeline. Chunks flow through the ``stages()`` transforms into ``load``, each stage runs as
+    its own task, connected by queues of ``queue_size`` chunks. A full queue pauses the stage
+    feeding it, so loading earlier chunks overlaps the extraction of later ones while memory stays
+    bound to a few chunks. Synchronous stages and ``load`` run in a worker thread, a stage returning
+    ``None`` drops the chunk. A ``transform_func`` runs first, on ``transform_workers`` chunks at once
+    in a process pool when more than one, otherwise as a synchronous stage.
+
+    ```python
+    class StreamingIngestion(AsyncIngestionTemplate):
+        def pre_extract(self):
+            self.writer = ChunkedFileWriter(Path("workers.parquet"), "parquet")
+
+        async def extract(self):
+            async for page in get_pages():
+                yield pd.DataFrame(page)
+
+        def stages(self):
+            return (self.clean,)
+
+        def clean(self, df):
+            return df.fillna(0)
+
+        def load(self, df):
+            self.writer.write(df)
+
+        def post_stream(self):
+            self.writer.close()
+    ```
     """
 
+    # chunks buffered between two stages of a streaming ingestion
+    queue_size: int = 4
+
     def pre_extract(self) -> None:
         """pre-hook logic before actual ingestion takes place, use this to set things up"""
         raise NotImplementedError()
@@ -70,18 +256,124 @@ class AsyncIngestionTemplate:
         for any updates to database or cleanup work.
         """
 
+    def stages(self) -> Sequence[Callable[[Any], Any]]:
+        """transforms applied in order to every chunk of a streaming ingestion, sync or async
+        callables taking a chunk and returning the transformed chunk, or ``None`` to drop it
+        """
+        return ()
+
+    def load(self, chunk: Any) -> Any:
+        """consumes every chunk of a streaming ingestion, sync or async, defaults to ``post_extract``"""
+        return self.post_extract(chunk)
+
+    def post_stream(self) -> None:
+        """post-hook logic once every chunk of a streaming ingestion is loaded"""
+
     async def _run(self) -> None:
         """Run the ingestion process"""
         self.pre_extract()
+        if inspect.isasyncgenfunction(self.extract):
+            await self._stream()
+            self.post_stream()
+            return
+
         df = await self.extract()
+        if self._transform_func() is not None:
+            df = await asyncio.to_thread(self.transform, df)
         self.post_extract(df)
 
+    async def _stream(self) -> int:
+        """runs extract, stages and load as concurrent tasks over bounded queues
+
+        :return: (int) - number of chunks loaded
+        """
+        stages: list = list(self.stages())
+        transform_func = self._transform_func()
+        if transform_func is not None and self.transform_workers > 1:
+            # marks where the parallel transform runs, first after extraction
+            stages.insert(0, _ParallelTransform)
+        elif transform_func is not None:
+            stages.insert(0, transform_func)
+        queues = [
+            asyncio.Queue(maxsize=self.queue_size) for _ in range(len(stages) + 1)
+        ]
+        loaded = 0
+
+        async def _apply(func: Callable[[Any], Any], chunk: Any) -> Any:
+            if inspect.iscoroutinefunction(func):
+                return await func(chunk)
+            # keep the loop serving the other stages
+            return await asyncio.to_thread(func, chunk)
+
+        async def _extract() -> None:
+            async for chunk in self.extract():  # type: ignore
+                await queues[0].put(chunk)
+            await queues[0].put(_END)
+
+        async def _transform(
+            func: Callable[[Any], Any], source: asyncio.Queue, sink: asyncio.Queue
+        ) -> None:
+            while (chunk := await source.get()) is not _END:
+                chunk = await _apply(func, chunk)
+                if chunk is not None:
+                    await sink.put(chunk)
+            await sink.put(_END)
+
+        async def _transform_parallel(
+            source: asyncio.Queue, sink: asyncio.Queue
+        ) -> None:
+            loop = asyncio.get_running_loop()
+            workers = self.transform_workers
+            pending: deque[asyncio.Future] = deque()
+            pool = ProcessPoolExecutor(max_workers=workers)
+            try:
+                while (chunk := await source.get()) is not _END:
+                    pending.append(loop.run_in_executor(pool, transform_func, chunk))
+                    if len(pending) >= workers:
+                        await sink.put(await pending.popleft())
+                while pending:
+                    await sink.put(await pending.popleft())
+            finally:
+                # never block the loop on the pool, not even when cancelled
+                pool.shutdown(wait=False, cancel_futures=True)
+            await sink.put(_END)
+
+        async def _load() -> None:
+            nonlocal loaded
+            while (chunk := await queues[-1].get()) is not _END:
+                await _apply(self.load, chunk)
+                loaded += 1
+
+        tasks = [
+            asyncio.create_task(_extract()),
+            *(
+                asyncio.create_task(
+                    _transform_parallel(source, sink)
+                    if func is _ParallelTransform
+                    else _transform(func, source, sink)
+                )
+                for func, source, sink in zip(stages, queues, queues[1:])
+            ),
+            asyncio.create_task(_load()),
+        ]
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            # a failed stage would leave the others waiting on their queues
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
+        Red.log(f"Streamed {loaded} chunks through {len(stages)} stages")
+        return loaded
+
     def run(self) -> None:
         """Run the ingestion process"""
         asyncio.run(self._run())
 
 
-class IngestionTemplate:
+class IngestionTemplate(_FrameBackend, _ParallelTransform):
     """
     A template designed for repeatable ingestion pattern by providing skeleton methods that should be
     defined by designer.
@@ -113,6 +405,23 @@ class IngestionTemplate:
     ci = CustomIngestion()
     ci.run()
     ```
+
+    Set ``backend = "polars"`` to build and write frames with polars through ``self.frames``,
+    i.e. ``self.frames.project(records, headers)`` and ``self.frames.write(df, path, "parquet")``.
+
+    CPU heavy transforms can run in parallel: set ``transform_func`` to a picklable function and
+    ``transform_workers`` to the number of processes, the extracted frame is split into row
+    partitions, transformed in a process pool and reassembled in order before ``post_extract``.
+
+    ```python
+    def cleanse(df):
+        df["name"] = df["name"].str.strip().str.title()
+        return df
+
+    class CustomIngestion(IngestionTemplate):
+        transform_func = cleanse
+        transform_workers = 8
+    ```
     """
 
     def pre_extract(self) -> None:
@@ -136,5 +445,6 @@ class IngestionTemplate:
         """Run the ingestion process"""
         self.pre_extract()
         df = self.extract()
+        df = self.transform(df)
         self.post_extract(df)
         return df
@@ -0,0 +1,126 @@
+"""
+Incremental file writers, append data frames to a single output file chunk by chunk
+so memory stays bound to the size of a chunk rather than the whole extract.
+"""
+
+from pathlib import Path
+from typing import Optional
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from ..red import Exit, LEVEL_CRITICAL
+from .backends import pl, stringify_nested
+
+
+class ChunkedFileWriter:
+    """
+    Writes data frames, pandas or polars, to one csv or parquet file as they arrive. Each chunk
+    becomes appended rows of a csv file, or a row group of a parquet file.
+
+    The parquet schema is fixed by the first chunk and later chunks are cast to it. The type of
+    a column with no values in the first chunk is undetermined, whatever the projection filled
+    it with, so it is written as strings and later values are cast to strings. Integer columns
+    are written as floats, a later chunk may hold fractions in the same column.
+
+    Example Usage:
+
+    ```python
+    from redutils.api.writers import ChunkedFileWriter
+
+    with ChunkedFileWriter(Path("workers.parquet"), "parquet") as writer:
+        for df in chunks():
+            writer.write(df)
+
+    print(writer.rows)
+    ```
+
+    :param path: (Path) - output file, truncated on first write
+    :param save_format: (str) - ``csv`` or ``parquet``
+    :param compression: (str) - parquet compression codec, defaults to ``snappy``
+    """
+
+    def __init__(
+        self, path: Path, save_format: str, compression: str = "snappy"
+    ) -> None:
+        if save_format not in ("csv", "parquet"):
+            Exit(LEVEL_CRITICAL, "Unknown save format")
+
+        self.path = Path(path)
+        self.save_format = save_format
+        self.compression = compression
+        self.rows = 0
+        self.chunks = 0
+        self._parquet: Optional[pq.ParquetWriter] = None
+
+    def __enter__(self) -> "ChunkedFileWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def write(self, df: pd.DataFrame) -> None:
+        """append a chunk to the output file
+
+        :param df: (DataFrame) - chunk to write, columns must match previous chunks
+        """
+        polars = pl is not None and isinstance(df, pl.DataFrame)
+
+        match self.save_format:
+            case "csv" if polars:
+                with open(self.path, "ab" if self.chunks else "wb") as f:
+                    stringify_nested(df).write_csv(f, include_header=not self.chunks)
+            case "csv":
+                df.to_csv(
+                    self.path,
+                    mode="a" if self.chunks else "w",
+                    index=False,
+                    header=not self.chunks,
+                )
+            case "parquet":
+                self._write_parquet(
+                    df.to_arrow()
+                    if polars
+                    else pa.Table.from_pandas(df, preserve_index=False)
+                )
+
+        self.rows += len(df)
+        self.chunks += 1
+
+    def close(self) -> None:
+        """flush and close the output file"""
+        if self._parquet is not None:
+            self._parquet.close()
+            self._parquet = None
+
+    @staticmethod
+    def _widen(field: pa.Field, empty: bool) -> pa.Field:
+        """the type of a column fixed from the first chunk, wide enough for later chunks"""
+        if empty:
+            return field.with_type(pa.string())
+        if pa.types.is_integer(field.type):
+            return field.with_type(pa.float64())
+        return field
+
+    def _write_parquet(self, table: pa.Table) -> None:
+        if self._parquet is None:
+            schema = pa.schema(
+                [
+                    self._widen(field, table.column(idx).null_count == table.num_rows)
+                    for idx, field in enumerate(table.schema)
+                ]
+            ).remove_metadata()
+            self._parquet = pq.ParquetWriter(
+                self.path, schema, compression=self.compression
+            )
+
+        try:
+            table = table.cast(self._parquet.schema)
+        except (pa.ArrowInvalid, pa.ArrowNotImplementedError, ValueError) as e:
+            Exit(
+                LEVEL_CRITICAL,
+                f"Chunk does not match schema of {self.path}: {e}",
+            )
+
+        self._parquet.write_table(table)
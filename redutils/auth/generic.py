@@ -2,12 +2,19 @@
 special token or password embedded in the header of a request.
 """
 
+import asyncio
+import os
+from contextlib import asynccontextmanager, nullcontext
+from pathlib import Path
 import requests
 import aiohttp
-from typing import Any, Callable, Dict, Optional
+from typing import Any, AsyncIterator, Callable, Dict, Optional
 from typing_extensions import Self
 from faker import Faker
 from ..red import Exit, Red, LEVEL_ERROR
+from ..api.concurrency import AdaptiveConcurrency, slot
+from ..api.ratelimit import RateLimiter
+from ..api.retry import RetryPolicy
 
 
 class GenericToken:
@@ -16,8 +23,19 @@ class GenericToken:
     special token or password embedded in the header of a request.
     """
 
-    def __init__(self, token_or_key: str) -> None:
+    rate_limiter: Optional[RateLimiter] = None
+    concurrency: Optional[AdaptiveConcurrency] = None
+
+    def __init__(
+        self, token_or_key: str, retry_policy: RetryPolicy | None = None
+    ) -> None:
+        """
+        :param token_or_key: (str) - token or key to use for authentication
+        :param retry_policy: (RetryPolicy|None) - retries of failed connections and 429/5xx responses in ``call``,
+            defaults to ``RetryPolicy()``
+        """
         self._token = token_or_key
+        self.retry_policy: RetryPolicy = retry_policy or RetryPolicy()
         self._headers = {"User-Agent": Faker().user_agent()}
         self.setup()
 
@@ -35,36 +53,175 @@ class GenericToken:
         **params: dict[str, Any],
     ) -> aiohttp.ClientResponse:
         """
-        :param func: (Callable) - function to call
+        The body is read before the connection is released, ``await response.json()`` and
+        ``await response.text()`` remain available on the returned response. Use ``stream`` or
+        ``download`` for bodies too large to hold in memory.
+
+        :param session: (ClientSession) - session to call with
+        :param method: (str) - HTTP method, ``get`` or ``post``
         :param url: (str) - url to call
-        :param params: (dict) - parameters to pass to function
+        :param params: (dict) - parameters to pass to ``aiohttp.ClientSession.request``
 
-        :return: (requests.Response) - response from function call
+        :return: (aiohttp.ClientResponse) - response with its body read
         """
-
-        Red.debug(f"Calling {method} with url: {url} and params: {params}")
         try:
-            match method:
-                case "get":
-                    async with session.get(
-                        url, headers=self.headers, **params
-                    ) as response:
-                        response.raise_for_status()
-                        return response
-                case "post":
-                    async with session.post(
-                        url, headers=self.headers, **params
-                    ) as response:
-                        response.raise_for_status()
-                        return response
-            Exit(LEVEL_ERROR, f"Invalid method {method} provided")
+            async with self._open(session, method, url, **params) as response:
+                await response.read()
+                return response
+        except Exception as e:
+            Exit(
+                LEVEL_ERROR,
+                f"Error calling {method} with url: {url} and params: {params}: {e}",
+            )
 
+    async def call_json(
+        self,
+        session: aiohttp.ClientSession,
+        method: str,
+        url: str,
+        **params: dict[str, Any],
+    ) -> Any:
+        """
+        :param session: (ClientSession) - session to call with
+        :param method: (str) - HTTP method, ``get`` or ``post``
+        :param url: (str) - url to call
+        :param params: (dict) - parameters to pass to ``aiohttp.ClientSession.request``
+
+        :return: (Any) - decoded JSON body
+        """
+        try:
+            async with self._open(session, method, url, **params) as response:
+                return await response.json(content_type=None)
         except Exception as e:
             Exit(
                 LEVEL_ERROR,
                 f"Error calling {method} with url: {url} and params: {params}: {e}",
             )
 
+    async def stream(
+        self,
+        session: aiohttp.ClientSession,
+        method: str,
+        url: str,
+        chunk_size: int = 1 << 16,
+        **params: dict[str, Any],
+    ) -> AsyncIterator[bytes]:
+        """yields the body in chunks as it arrives, the connection is held until the body is
+        consumed or the generator is closed
+
+        Example Usage:
+
+        ```python
+        async for chunk in src.stream(session, "get", export_url):
+            sink.write(chunk)
+        ```
+
+        :param session: (ClientSession) - session to call with
+        :param method: (str) - HTTP method, ``get`` or ``post``
+        :param url: (str) - url to call
+        :param chunk_size: (int) - upper bound of a chunk, in bytes, defaults to 64KiB
+        :param params: (dict) - parameters to pass to ``aiohttp.ClientSession.request``
+
+        :return: async generator of ``bytes``
+        """
+        try:
+            async with self._open(session, method, url, **params) as response:
+                async for chunk in response.content.iter_chunked(chunk_size):
+                    yield chunk
+        except Exception as e:
+            Exit(
+                LEVEL_ERROR,
+                f"Error streaming {method} with url: {url} and params: {params}: {e}",
+            )
+
+    async def download(
+        self,
+        session: aiohttp.ClientSession,
+        method: str,
+        url: str,
+        path: Path,
+        chunk_size: int = 1 << 16,
+        **params: dict[str, Any],
+    ) -> int:
+        """streams the body straight to a file
+
+        The body is written next to ``path`` and moved in place once complete, an interrupted
+        download never leaves a partial file at ``path``.
+
+        :param session: (ClientSession) - session to call with
+        :param method: (str) - HTTP method, ``get`` or ``post``
+        :param url: (str) - url to call
+        :param path: (Path) - file to write the body to, replaced if it exists
+        :param chunk_size: (int) - upper bound of a chunk, in bytes, defaults to 64KiB
+        :param params: (dict) - parameters to pass to ``aiohttp.ClientSession.request``
+
+        :return: (int) - bytes written
+        """
+        path = Path(path)
+        part = path.with_name(f"{path.name}.part")
+        written = 0
+        try:
+            with open(part, "wb") as f:
+                async for chunk in self.stream(
+                    session, method, url, chunk_size=chunk_size, **params
+                ):
+                    f.write(chunk)
+                    written += len(chunk)
+            os.replace(part, path)
+        finally:
+            part.unlink(missing_ok=True)
+
+        Red.debug(f"Downloaded {written} bytes to {path}")
+        return written
+
+    @asynccontextmanager
+    async def _open(
+        self,
+        session: aiohttp.ClientSession,
+        method: str,
+        url: str,
+        **params: dict[str, Any],
+    ) -> AsyncIterator[aiohttp.ClientResponse]:
+        """opens a successful response, body unread, retrying as per ``retry_policy``"""
+        Red.debug(f"Calling {method} with url: {url} and params: {params}")
+        if method not in ("get", "post"):
+            Exit(LEVEL_ERROR, f"Invalid method {method} provided")
+
+        policy = self.retry_policy
+        attempt = 0
+        opened = False
+        while True:
+            try:
+                async with self.rate_limiter or nullcontext(), slot(
+                    self.concurrency
+                ) as held, session.request(
+                    method, url, headers=self.headers, **params
+                ) as response:
+                    held.status = response.status
+                    if (
+                        not policy.retryable(response.status)
+                        or attempt >= policy.max_retries
+                    ):
+                        response.raise_for_status()
+                        opened = True
+                        yield response
+                        return
+
+                    wait = policy.delay(attempt, response.headers.get("Retry-After"))
+                    Red.warn(
+                        f"Status {response.status} on {url}...retrying in {wait:.1f}s"
+                    )
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                # failures while the caller reads the body are not retried
+                if opened or attempt >= policy.max_retries:
+                    raise
+                wait = policy.delay(attempt)
+                Red.warn(f"{e!r}...retrying in {wait:.1f}s")
+
+            policy.record()
+            attempt += 1
+            await asyncio.sleep(wait)
+
     def set_header(self, key: str, value: str) -> Self:
         """
         :param key: (str) - key to set
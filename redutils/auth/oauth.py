@@ -4,15 +4,131 @@
 
 from pathlib import Path
 from datetime import datetime
+import asyncio
+import hashlib
+import json
+import os
 import traceback
 import tempfile
+import threading
 import time
-from typing import Any, Callable, Dict, Optional
+from contextlib import contextmanager, nullcontext
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
 from typing_extensions import Self
+import aiohttp
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
 
 
 from ..red import Exit, Red, LEVEL_ERROR, LEVEL_CRITICAL
+from ..api.concurrency import AdaptiveConcurrency, slot
+from ..api.ratelimit import RateLimiter
+from ..api.retry import RetryPolicy
+
+
+class _TokenState:
+    """container class to hold the api token, shared by every ``OAuthApi`` using it"""
+
+    def __init__(self) -> None:
+        self.token: str | None = None
+        self.expires_in: int | None = None
+        self.timer: datetime | None = None
+        self.refresher: threading.Timer | None = None
+        self.closed: bool = False
+        # held while refreshing, so concurrent refreshes collapse into one
+        self.lock = threading.Lock()
+
+
+class _TokenCache:
+    """
+    File based token cache shared between processes on the same host, keyed by the
+    authorize url and client id. Access is serialized with a lock file, a lock older
+    than ``lock_timeout`` is considered abandoned and removed.
+
+    :param cache_dir: (Path) - directory of the cache and lock files
+    :param authorize_url: (str) - url the token was requested from
+    :param client_id: (str) - client the token was issued to
+    :param margin: (int) - seconds before expiry a cached token is no longer handed out, defaults to 60
+    :param lock_timeout: (int) - seconds to wait for the lock, defaults to 30
+    """
+
+    def __init__(
+        self,
+        cache_dir: Path,
+        authorize_url: str,
+        client_id: str,
+        margin: int = 60,
+        lock_timeout: int = 30,
+    ) -> None:
+        key = hashlib.sha256(f"{authorize_url}|{client_id}".encode()).hexdigest()
+        self.path = Path(cache_dir) / f"redutils_token_{key}.json"
+        self._lock_path = self.path.with_suffix(".lock")
+        self._margin = margin
+        self._lock_timeout = lock_timeout
+
+    @contextmanager
+    def lock(self) -> Iterator[bool]:
+        """holds the lock file, yields ``False`` if it could not be acquired in time"""
+        deadline = time.monotonic() + self._lock_timeout
+        acquired = False
+        while not acquired:
+            try:
+                os.close(os.open(self._lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+                acquired = True
+            except FileExistsError:
+                try:
+                    if (
+                        time.time() - self._lock_path.stat().st_mtime
+                        > self._lock_timeout
+                    ):
+                        self._lock_path.unlink(missing_ok=True)
+                        continue
+                except FileNotFoundError:
+                    continue
+                if time.monotonic() > deadline:
+                    break
+                time.sleep(0.1)
+
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                self._lock_path.unlink(missing_ok=True)
+
+    def read(self) -> Optional[Tuple[str, int, datetime]]:
+        """reads the cached token, ``None`` if missing, unreadable or about to expire
+
+        :return: token, expires_in and the time it was issued
+        """
+        try:
+            with open(self.path, "r") as f:
+                cached = json.load(f)
+            obtained = datetime.fromtimestamp(cached["obtained"])
+            expires_in = cached["expires_in"]
+            token = cached["token"]
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+        age = (datetime.now() - obtained).total_seconds()
+        if age >= float(expires_in) - self._margin:
+            return None
+        return token, expires_in, obtained
+
+    def write(self, token: str, expires_in: int, obtained: datetime) -> None:
+        """atomically replaces the cached token, readable by the current user only"""
+        tmp = self.path.with_suffix(f".{os.getpid()}.tmp")
+        fd = os.open(tmp, os.O_CREAT | os.O_TRUNC | os.O_WRONLY, 0o600)
+        with os.fdopen(fd, "w") as f:
+            json.dump(
+                {
+                    "token": token,
+                    "expires_in": expires_in,
+                    "obtained": obtained.timestamp(),
+                },
+                f,
+            )
+        os.replace(tmp, self.path)
 
 
 class OAuthApi:
@@ -61,26 +177,61 @@ class OAuthApi:
 
     """
 
+    rate_limiter: Optional[RateLimiter] = None
+    concurrency: Optional[AdaptiveConcurrency] = None
+
     def __init__(
         self,
         client_id: str,
         client_secret: str,
         grant_type: str = "client_credentials",
         timeout: int = 600,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        max_retries: int = 0,
+        compression: bool = True,
+        refresh_at: float | None = 0.8,
+        refresh_sleep: bool = False,
+        token_cache: bool = True,
+        retry_policy: RetryPolicy | None = None,
     ):
         """
         :param client_id: (str) - client id or username
         :param client_secret: (str) - client secret or password
         :param grant_type: (str) - grant_type, defaults to 'client_credentials'
         :param timeout: (int) - time, in seconds, to wait for response timeout, defaults to 600 seconds (10 min)
+        :param pool_connections: (int) - number of host connection pools kept by each session, defaults to 10
+        :param pool_maxsize: (int) - connections kept alive per host, size this to the number of concurrent callers, defaults to 10
+        :param max_retries: (int) - retries of failed connections, mounted on the sessions, defaults to 0
+        :param compression: (bool) - negotiate compressed responses (gzip, deflate, and br/zstd when available), defaults to True
+        :param refresh_at: (float|None) - fraction of ``expires_in`` after which the token is renewed in the background,
+            ``None`` only refreshes on expiry or 401, defaults to 0.8
+        :param refresh_sleep: (bool) - wait 60 seconds before refreshing an expired token, for servers that need it, defaults to False
+        :param token_cache: (bool) - reuse a valid token cached in the temp directory by other processes, defaults to True
+        :param retry_policy: (RetryPolicy|None) - retries of failed connections and 429/5xx responses in ``smart_call``,
+            defaults to ``RetryPolicy()``
         """
         self.client_id: str = client_id
         self.client_secret: str = client_secret
         self.authorize_url: str | None = None
         self.endpoint_url: str | None = None
         self._timeout: int = timeout
-        self._main_session: requests.Session = requests.Session()
-        self._auth_session: requests.Session = requests.Session()
+        self._refresh_at: float | None = refresh_at
+        self._refresh_sleep: bool = refresh_sleep
+        self._token_cache: bool = token_cache
+        self.retry_policy: RetryPolicy = retry_policy or RetryPolicy()
+        self._main_session: requests.Session = self._make_session(
+            pool_connections, pool_maxsize, max_retries, compression
+        )
+        self._auth_session: requests.Session = self._make_session(
+            pool_connections, pool_maxsize, max_retries, compression
+        )
+        self._transfer_lock = threading.Lock()
+        self._transfer_stats: Dict[str, int] = {
+            "requests": 0,
+            "bytes_received": 0,
+            "bytes_decoded": 0,
+        }
 
         self._auth_data: Dict[str, str] = {
             "grant_type": grant_type,
@@ -88,9 +239,8 @@ class OAuthApi:
             "client_secret": self.client_secret,
         }
 
-        self._api_token: str | None = None
-        self._api_expires_in: int | None = None
-        self._api_internal_timer: datetime | None = None
+        self._token_state: _TokenState = _TokenState()
+        self._owns_sessions: bool = True
         self._cache_dir: Path = Path(tempfile.gettempdir())
 
         self.setup()
@@ -98,6 +248,10 @@ class OAuthApi:
         if self.authorize_url is None or self.endpoint_url is None:
             Exit(LEVEL_CRITICAL, "Authorize/Endpoint Url is not defined")
 
+        self._cache: _TokenCache = _TokenCache(
+            self._cache_dir, str(self.authorize_url), self.client_id
+        )
+
     def __enter__(self) -> Self:
         self.refresh_token()
         return self
@@ -108,13 +262,120 @@ class OAuthApi:
         exc_val: Optional[BaseException],
         exc_tb: Optional[traceback.TracebackException],
     ) -> None:
-        self._main_session.close()
-        self._auth_session.close()
+        stats = self.transfer_stats
+        if stats["requests"]:
+            Red.log(
+                f"Transferred {stats['bytes_received']} bytes ({stats['bytes_decoded']} decoded) "
+                f"over {stats['requests']} requests, {self.retry_policy.retries} retried"
+            )
+        if self.concurrency is not None:
+            Red.log(f"Adaptive concurrency: {self.concurrency.stats}")
+        if self.rate_limiter is not None:
+            limited = self.rate_limiter.stats
+            Red.log(
+                f"Rate limiter let {limited['requests']} requests through, "
+                f"waited {limited['waited']}s"
+            )
+
+        if self._owns_sessions:
+            self._token_state.closed = True
+            if self._token_state.refresher is not None:
+                self._token_state.refresher.cancel()
+            self._main_session.close()
+            self._auth_session.close()
+
+    @staticmethod
+    def _make_session(
+        pool_connections: int, pool_maxsize: int, max_retries: int, compression: bool
+    ) -> requests.Session:
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            max_retries=max_retries,
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        session.headers["Accept-Encoding"] = (
+            ACCEPT_ENCODING if compression else "identity"
+        )
+        session.headers["Connection"] = "keep-alive"
+        return session
+
+    @property
+    def transfer_stats(self) -> Dict[str, int]:
+        """requests made through ``smart_call``, with the bytes received on the wire and after decompression"""
+        with self._transfer_lock:
+            return dict(self._transfer_stats)
+
+    def _record_transfer(self, resp: requests.Response, streamed: bool) -> None:
+        try:
+            received = int(resp.raw.tell())
+        except Exception:
+            received = int(resp.headers.get("Content-Length") or 0)
+
+        # a streamed body is left for the caller to consume
+        decoded = 0 if streamed else len(resp.content)
+
+        with self._transfer_lock:
+            self._transfer_stats["requests"] += 1
+            self._transfer_stats["bytes_received"] += received
+            self._transfer_stats["bytes_decoded"] += decoded
+
+    @property
+    def _api_token(self) -> str | None:
+        return self._token_state.token
+
+    @_api_token.setter
+    def _api_token(self, value: str | None) -> None:
+        self._token_state.token = value
+
+    @property
+    def _api_expires_in(self) -> int | None:
+        return self._token_state.expires_in
+
+    @_api_expires_in.setter
+    def _api_expires_in(self, value: int | None) -> None:
+        self._token_state.expires_in = value
+
+    @property
+    def _api_internal_timer(self) -> datetime | None:
+        return self._token_state.timer
+
+    @_api_internal_timer.setter
+    def _api_internal_timer(self, value: datetime | None) -> None:
+        self._token_state.timer = value
 
     @property
     def auth_header(self) -> dict[str, str]:
         return {"Authorization": f"Bearer {self._api_token}"}
 
+    def share(self, other: "OAuthApi") -> Self:
+        """Reuse the sessions and token of another instance, authenticated with the same credentials.
+
+        A token refresh by any of the instances is seen by all of them. Sessions are
+        closed by the instance that created them.
+
+        ```python
+        with ExampleDataSourceUsing(client_id, client_secret) as src:
+            other = AnotherDataSourceUsing(client_id, client_secret).share(src)
+            other.get_all_the_things()
+        ```
+
+        :param other: (OAuthApi) - the instance to share with
+
+        :return: Self
+        """
+        if self._owns_sessions:
+            self._main_session.close()
+            self._auth_session.close()
+
+        self._main_session = other._main_session
+        self._auth_session = other._auth_session
+        self._token_state = other._token_state
+        self._owns_sessions = False
+        return self
+
     def smart_call(
         self, func: Callable[..., requests.Response], url: str, **params: dict[str, Any]
     ) -> Optional[requests.Response]:
@@ -130,12 +391,19 @@ class OAuthApi:
 
         """
 
+        used: str | None = None
+
         def _call_func() -> requests.Response:
+            nonlocal used
+            used = self._api_token
             if "headers" in params:
                 params["headers"].update(self.auth_header)
             else:
                 params["headers"] = self.auth_header
-            return func(url, timeout=self._timeout, **params)
+            with self.rate_limiter or nullcontext(), slot(self.concurrency) as held:
+                resp = func(url, timeout=self._timeout, **params)
+                held.status = resp.status_code
+                return resp
 
         if not callable(func):
             Exit(LEVEL_CRITICAL, f"passed func is not callable: {func}")
@@ -147,68 +415,460 @@ class OAuthApi:
                 datetime.now() - self._api_internal_timer
             ).seconds >= self._api_expires_in:
                 Red.log("Token about to expire...refreshing")
-                self.refresh_token(sleep=True)
-
-        try:
-            # hard to type this without generics
-            # but, `func` expects to be a valid requests HTTP method
-            # i.e: `get`, `post`
-            Red.log(f"Calling: {url}")
-            resp = _call_func()
+                self.refresh_token(sleep=self._refresh_sleep)
 
-            if resp.status_code == 401:  # edge case: expired token
-                Red.log("Token expired...refreshing")
-                self.refresh_token(sleep=True)
+        policy = self.retry_policy
+        attempt = 0
+        refreshed = False
 
-                resp = _call_func()
-
-            if 200 > resp.status_code > 299:
-                Exit(LEVEL_ERROR, f"Unsuccessful api call: {resp.url}")
+        try:
+            while True:
+                # hard to type this without generics
+                # but, `func` expects to be a valid requests HTTP method
+                # i.e: `get`, `post`
+                Red.log(f"Calling: {url}")
+                try:
+                    resp = _call_func()
+                except (
+                    requests.ConnectionError,
+                    requests.Timeout,
+                    # connection reset or corrupted while the body is read
+                    requests.exceptions.ChunkedEncodingError,
+                    requests.exceptions.ContentDecodingError,
+                ) as e:
+                    if attempt >= policy.max_retries:
+                        raise
+                    wait = policy.delay(attempt)
+                    Red.warn(f"{e}...retrying in {wait:.1f}s")
+                else:
+                    self._record_transfer(resp, bool(params.get("stream")))
+
+                    if resp.status_code == 401 and not refreshed:
+                        # edge case: expired token
+                        Red.log("Token expired...refreshing")
+                        self.refresh_token(sleep=self._refresh_sleep, stale=used)
+                        refreshed = True
+                        continue
+
+                    if (
+                        not policy.retryable(resp.status_code)
+                        or attempt >= policy.max_retries
+                    ):
+                        break
+
+                    wait = policy.delay(attempt, resp.headers.get("Retry-After"))
+                    Red.warn(
+                        f"Status {resp.status_code} on {url}...retrying in {wait:.1f}s"
+                    )
+                    resp.close()
+
+                policy.record()
+                attempt += 1
+                time.sleep(wait)
+
+            if not 200 <= resp.status_code <= 299:
+                Exit(
+                    LEVEL_ERROR,
+                    f"Unsuccessful api call: {resp.status_code} {resp.url}",
+                )
             return resp
         except Exception as e:
             Exit(LEVEL_CRITICAL, str(e))
         return None
 
-    def refresh_token(self, sleep: bool = False) -> str | None:
-        """Refreshes token based on set value for authorized_url and provided credentials
+    def refresh_token(
+        self, sleep: bool = False, stale: str | None = None
+    ) -> str | None:
+        """Refreshes token based on set value for authorized_url and provided credentials,
+        then schedules the next background refresh, see ``refresh_at``.
+
+        Refreshes are single-flight: concurrent callers wait for the one in progress and reuse
+        its token, instead of requesting (and sleeping for) one each.
+
+        With ``token_cache`` a valid token, other than the current one, cached by another
+        process is reused instead of requesting a new one.
 
         :param sleep: (bool, defaults=False) - enforce a thread-stopping wait before refreshing
+        :param stale: (str|None) - the token that failed, nothing is refreshed if it was already
+            replaced, defaults to the current token
 
         :return: str
 
         """
-        if sleep:
-            time.sleep(60)
+        stale = stale or self._api_token
+        with self._token_state.lock:
+            if self._api_token is not None and self._api_token != stale:
+                Red.log("Token already refreshed")
+                return self._api_token
+
+            if sleep:
+                time.sleep(60)
+
+            Red.debug(f"Old Access Token: {self._api_token}")
+            try:
+                token, expires_in, obtained = self._obtain_token(stale=stale)
+            except ValueError as e:
+                Exit(LEVEL_ERROR, str(e))
+            except Exception as e:
+                Exit(LEVEL_CRITICAL, f"{e}\n{traceback.format_exc()}")
+
+            self._set_token(token, expires_in, obtained)
+            Red.log("Token refreshed")
+            Red.debug(f"New Token: {self._api_token}")
+            return self._api_token
+
+    def _request_token(self) -> Tuple[str, int]:
+        """requests a new token from the authorize url
+
+        :raises: ValueError - on an unsuccessful response or a payload without token
+        """
         headers = {"Content-Type": "application/x-www-form-urlencoded"}
-        if self._api_internal_timer is None:
-            self._api_internal_timer = datetime.now()
+        resp = self._auth_session.post(
+            str(self.authorize_url), headers=headers, data=self._auth_data
+        )
+        if not 200 <= resp.status_code <= 299:
+            raise ValueError(f"Unable to refresh token: {resp.status_code}")
 
-        try:
-            resp = self._auth_session.post(
-                str(self.authorize_url), headers=headers, data=self._auth_data
+        payload = resp.json()
+        token = payload.get("access_token")
+        expires_in = payload.get("expires_in")
+
+        if not token or not expires_in:
+            raise ValueError("Refresh token failed")
+        return token, expires_in
+
+    def _obtain_token(self, stale: str | None) -> Tuple[str, int, datetime]:
+        """a token from the cache when it is valid and not ``stale``, otherwise a newly requested one"""
+        if not self._token_cache:
+            return (*self._request_token(), datetime.now())
+
+        with self._cache.lock() as locked:
+            cached = self._cache.read()
+            if cached is not None and cached[0] != stale:
+                Red.log("Using cached token")
+                return cached
+
+            token, expires_in = self._request_token()
+            obtained = datetime.now()
+            if locked:
+                try:
+                    self._cache.write(token, expires_in, obtained)
+                except OSError as e:
+                    Red.warn(f"Unable to cache token: {e}")
+            return token, expires_in, obtained
+
+    def _set_token(
+        self, token: str, expires_in: int, obtained: datetime | None = None
+    ) -> None:
+        self._api_token = token
+        self._api_expires_in = expires_in
+        self._api_internal_timer = obtained or datetime.now()
+        self._schedule_refresh()
+
+    def _schedule_refresh(self) -> None:
+        """(re)starts the background refresh of the shared token"""
+        state = self._token_state
+        if state.refresher is not None:
+            state.refresher.cancel()
+            state.refresher = None
+
+        if self._refresh_at is None or not state.expires_in or state.closed:
+            return
+
+        # a cached token may already be part way through its lifetime
+        elapsed = (datetime.now() - (state.timer or datetime.now())).total_seconds()
+        state.refresher = threading.Timer(
+            max(float(state.expires_in) * self._refresh_at - elapsed, 0),
+            self._background_refresh,
+        )
+        state.refresher.daemon = True
+        state.refresher.start()
+
+    def _background_refresh(self) -> None:
+        stale = self._api_token
+        with self._token_state.lock:
+            if self._api_token != stale:
+                # refreshed by a caller meanwhile, which rescheduled the refresh
+                return
+
+            try:
+                token, expires_in, obtained = self._obtain_token(stale=stale)
+            except Exception as e:
+                # leave it to smart_call, on expiry or 401
+                Red.warn(f"Background token refresh failed: {e}")
+                return
+
+            self._set_token(token, expires_in, obtained)
+            Red.log("Token refreshed in background")
+
+    def setup(self) -> None:
+        """Overload this function on custom classes to setup object"""
+
+
+class AsyncOAuthApi:
+    """
+    Asynchronous RestAPI implementation of OAuth2.0, built on aiohttp.
+
+    Same blueprint as ``OAuthApi``: subclass it around a specific data source and define
+    ``authorize_url`` and ``endpoint_url`` in ``setup()``. A single ``aiohttp.ClientSession`` is
+    opened when entering the async context, all calls share it and its token.
+
+    Mix it in with ``AsyncIngestionTemplate`` and ``run()`` opens the session, authenticates,
+    runs the ingestion and closes the session.
+
+    Example Usage:
+
+    ```python
+    import asyncio
+
+    from redutils.auth.oauth import AsyncOAuthApi
+    from redutils.api.templates import AsyncIngestionTemplate
+
+    class ExampleDataSource(AsyncOAuthApi, AsyncIngestionTemplate):
+        def setup(self):
+            self.authorize_url = "https://example.com/token"
+            self.endpoint_url = "https://example.com/api/"
+
+        def pre_extract(self):
+            pass
+
+        async def extract(self):
+            responses = await asyncio.gather(
+                *(self.smart_call("get", f"{self.endpoint_url}things/{i}") for i in range(100))
             )
-            if 200 > resp.status_code > 299:
-                Exit(LEVEL_ERROR, f"Unable to refresh token: {resp.status_code}")
-        except Exception as e:
-            Exit(LEVEL_CRITICAL, f"{e}\n{traceback.format_exc()}")
+            return pd.DataFrame([await r.json() for r in responses])
+
+    ExampleDataSource(client_id, client_secret).run()
+    ```
+    """
+
+    rate_limiter: Optional[RateLimiter] = None
+    concurrency: Optional[AdaptiveConcurrency] = None
+
+    def __init__(
+        self,
+        client_id: str,
+        client_secret: str,
+        grant_type: str = "client_credentials",
+        timeout: int = 600,
+        limit: int = 100,
+        limit_per_host: int = 0,
+        refresh_at: float | None = 0.8,
+        refresh_sleep: bool = False,
+        retry_policy: RetryPolicy | None = None,
+    ):
+        """
+        :param client_id: (str) - client id or username
+        :param client_secret: (str) - client secret or password
+        :param grant_type: (str) - grant_type, defaults to 'client_credentials'
+        :param timeout: (int) - time, in seconds, to wait for response timeout, defaults to 600 seconds (10 min)
+        :param limit: (int) - maximum number of open connections, defaults to 100
+        :param limit_per_host: (int) - maximum number of open connections per host, 0 is unlimited, defaults to 0
+        :param refresh_at: (float|None) - fraction of ``expires_in`` after which the next call renews the token,
+            ``None`` only refreshes on expiry or 401, defaults to 0.8
+        :param refresh_sleep: (bool) - wait 60 seconds before refreshing an expired token, for servers that need it, defaults to False
+        :param retry_policy: (RetryPolicy|None) - retries of failed connections and 429/5xx responses in ``smart_call``,
+            defaults to ``RetryPolicy()``
+        """
+        self.client_id: str = client_id
+        self.client_secret: str = client_secret
+        self.authorize_url: str | None = None
+        self.endpoint_url: str | None = None
+        self._timeout: int = timeout
+        self._limit: int = limit
+        self._limit_per_host: int = limit_per_host
+        self._refresh_at: float | None = refresh_at
+        self._refresh_sleep: bool = refresh_sleep
+        self.retry_policy: RetryPolicy = retry_policy or RetryPolicy()
+        self._session: aiohttp.ClientSession | None = None
+        self._refresh_lock: asyncio.Lock | None = None
+
+        self._auth_data: Dict[str, str] = {
+            "grant_type": grant_type,
+            "client_id": self.client_id,
+            "client_secret": self.client_secret,
+        }
+
+        self._token_state: _TokenState = _TokenState()
+
+        self.setup()
+
+        if self.authorize_url is None or self.endpoint_url is None:
+            Exit(LEVEL_CRITICAL, "Authorize/Endpoint Url is not defined")
+
+    async def __aenter__(self) -> Self:
+        self._session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=self._limit, limit_per_host=self._limit_per_host
+            ),
+            timeout=aiohttp.ClientTimeout(total=self._timeout),
+        )
+        self._refresh_lock = asyncio.Lock()
+        await self.refresh_token()
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc_val: Optional[BaseException],
+        exc_tb: Optional[traceback.TracebackException],
+    ) -> None:
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def _run(self) -> None:
+        """Run the ingestion process of a mixed in ``AsyncIngestionTemplate`` within an authenticated session"""
+        async with self:
+            await super()._run()  # type: ignore
+
+    @property
+    def auth_header(self) -> dict[str, str]:
+        return {"Authorization": f"Bearer {self._token_state.token}"}
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        if self._session is None:
+            Exit(LEVEL_CRITICAL, "Session not opened, use `async with` first")
+        return self._session  # type: ignore
+
+    async def smart_call(
+        self, method: str, url: str, **params: Any
+    ) -> Optional[aiohttp.ClientResponse]:
+        """Helper caller blueprint method that handles auto token refresh
+
+        The body is read before the connection is released, ``await resp.json()`` and
+        ``await resp.text()`` remain available on the returned response.
+
+        :param method: (str) - HTTP method, `get`, `post`, ...
+        :param url: (str) - the completed url desired to request data from
+        :param params: (**kwargs) - key-value pairs valid for ``aiohttp.ClientSession.request``
+
+        :return: `ClientResponse`_
+
+        .. _ClientResponse: https://docs.aiohttp.org/en/stable/client_reference.html#aiohttp.ClientResponse
+        """
+        state = self._token_state
+        if state.expires_in and state.timer:
+            elapsed = (datetime.now() - state.timer).seconds
+            if elapsed >= float(state.expires_in) * (self._refresh_at or 1):
+                Red.log("Token about to expire...refreshing")
+                await self.refresh_token(
+                    sleep=elapsed >= float(state.expires_in) and self._refresh_sleep
+                )
+
+        policy = self.retry_policy
+        attempt = 0
+        refreshed = False
 
         try:
-            payload = resp.json()
-            Red.debug(f"Old Access Token: {self._api_token}")
-            token = payload.get("access_token")
-            expires_in = payload.get("expires_in")
+            while True:
+                Red.log(f"Calling: {url}")
+                used = self._token_state.token
+                try:
+                    resp = await self._call(method, url, **params)
+                except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                    if attempt >= policy.max_retries:
+                        raise
+                    wait = policy.delay(attempt)
+                    Red.warn(f"{e!r}...retrying in {wait:.1f}s")
+                else:
+                    if resp.status == 401 and not refreshed:
+                        # edge case: expired token
+                        Red.log("Token expired...refreshing")
+                        await self.refresh_token(sleep=self._refresh_sleep, stale=used)
+                        refreshed = True
+                        continue
+
+                    if (
+                        not policy.retryable(resp.status)
+                        or attempt >= policy.max_retries
+                    ):
+                        break
+
+                    wait = policy.delay(attempt, resp.headers.get("Retry-After"))
+                    Red.warn(f"Status {resp.status} on {url}...retrying in {wait:.1f}s")
+
+                policy.record()
+                attempt += 1
+                await asyncio.sleep(wait)
+
+            if not 200 <= resp.status <= 299:
+                Exit(LEVEL_ERROR, f"Unsuccessful api call: {resp.status} {resp.url}")
+            return resp
         except Exception as e:
-            Exit(LEVEL_CRITICAL, f"{traceback.format_exc()}")
+            Exit(LEVEL_CRITICAL, str(e))
+        return None
 
-        if not token or not expires_in:
-            Exit(LEVEL_ERROR, "Refresh token failed")
+    async def _call(
+        self, method: str, url: str, **params: Any
+    ) -> aiohttp.ClientResponse:
+        headers = {**params.get("headers", {}), **self.auth_header}
+        params = {k: v for k, v in params.items() if k != "headers"}
+        async with self.rate_limiter or nullcontext(), slot(self.concurrency) as held:
+            async with self.session.request(
+                method, url, headers=headers, **params
+            ) as resp:
+                await resp.read()
+                held.status = resp.status
+                return resp
+
+    async def refresh_token(
+        self, sleep: bool = False, stale: str | None = None
+    ) -> str | None:
+        """Refreshes token based on set value for authorized_url and provided credentials.
+        Concurrent callers wait on the same lock and reuse the token of the refresh that ran
+        while they waited, only one request for a token is made at a time.
+
+        :param sleep: (bool, defaults=False) - enforce a wait before refreshing, other tasks keep running
+        :param stale: (str|None) - the token that failed, nothing is refreshed if it was already
+            replaced, defaults to the current token
 
-        self._api_token = token
-        self._api_expires_in = expires_in
-        self._api_internal_timer = datetime.now()
-        Red.log("Token refreshed")
-        Red.debug(f"New Token: {self._api_token}")
-        return self._api_token
+        :return: str
+        """
+        stale = stale or self._token_state.token
+        async with self._refresh_lock:  # type: ignore
+            if self._token_state.token is not None and self._token_state.token != stale:
+                Red.log("Token already refreshed")
+                return self._token_state.token
+
+            if sleep:
+                await asyncio.sleep(60)
+
+            Red.debug(f"Old Access Token: {self._token_state.token}")
+            try:
+                token, expires_in = await self._request_token()
+            except ValueError as e:
+                Exit(LEVEL_ERROR, str(e))
+            except Exception as e:
+                Exit(LEVEL_CRITICAL, f"{e}\n{traceback.format_exc()}")
+
+            self._token_state.token = token
+            self._token_state.expires_in = expires_in
+            self._token_state.timer = datetime.now()
+            Red.log("Token refreshed")
+            Red.debug(f"New Token: {self._token_state.token}")
+            return self._token_state.token
+
+    async def _request_token(self) -> Tuple[str, int]:
+        """requests a new token from the authorize url
+
+        :raises: ValueError - on an unsuccessful response or a payload without token
+        """
+        headers = {"Content-Type": "application/x-www-form-urlencoded"}
+        async with self.session.post(
+            str(self.authorize_url), headers=headers, data=self._auth_data
+        ) as resp:
+            if not 200 <= resp.status <= 299:
+                raise ValueError(f"Unable to refresh token: {resp.status}")
+            payload = await resp.json(content_type=None)
+
+        token = payload.get("access_token")
+        expires_in = payload.get("expires_in")
+
+        if not token or not expires_in:
+            raise ValueError("Refresh token failed")
+        return token, expires_in
 
     def setup(self) -> None:
         """Overload this function on custom classes to setup object"""
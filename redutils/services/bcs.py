@@ -1,21 +1,42 @@
-import base64
-import lzma
-import pickle
 import tempfile
 import traceback
 import time
 
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+
 import pandas as pd
-import numpy as np
 
 from pathlib import Path
-from typing import Any, Callable, Tuple, List, Dict, Optional
-from datetime import date
-
-
-from ..red import Red, Exit, LEVEL_CRITICAL, LEVEL_ERROR, WherescapeProtocol
-from ..api.templates import IngestionTemplate
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Generator,
+    Iterator,
+    Set,
+    Tuple,
+    Type,
+    List,
+    Dict,
+    Optional,
+)
+from datetime import date, datetime, timedelta
+
+
+from ..red import (
+    Red,
+    Exit,
+    LEVEL_CRITICAL,
+    LEVEL_ERROR,
+    RedParameter,
+    WherescapeProtocol,
+)
+from ..api.templates import IngestionTemplate, plan_windows
 from ..api.odata import ODataUrl
+from ..api.checkpoint import SegmentCheckpoint
+from ..api.writers import ChunkedFileWriter
+from ..api.flatten import compile_headers
 from ..auth.oauth import OAuthApi
 
 
@@ -36,73 +57,163 @@ class BCSApi(OAuthApi, IngestionTemplate):
 
         * `BCSApi.authorize_url: str` - https://odata-nextgen.bakerhillsolutions.net/token
         * `BCSApi.endpoint_url: str` - https://odata-nextgen.bakerhillsolutions.net/odata/
+        * `BCSApi.resume: bool|None` - resume from checkpoints, ``None`` reads the ``.crash_detected`` marker
         """
         self.authorize_url = "https://odata-nextgen.bakerhillsolutions.net/token"
         self.endpoint_url = "https://odata-nextgen.bakerhillsolutions.net/odata/"
 
         self.load_dir = None
+        self.resume: Optional[bool] = None
 
-    def query(self, prepared_url: str, max_pages: Optional[int] = None) -> Any:
-        """query the data from bcs, and continue until no more data is retrieved
-        Smart query, saves a checkpoint of records as it pulls data from object.
+    def _crashed(self) -> bool:
+        """whether the last run crashed and checkpoints should be resumed
+
+        Unless ``resume`` is set, reads the ``.crash_detected`` marker and removes it, so a run
+        only resumes once.
+
+        :return: bool
+        """
+        if self.resume is not None:
+            return self.resume
+
+        crash_file = Path(".crash_detected")
+        if not crash_file.is_file():
+            return False
+        crash_file.unlink()
+        return True
 
-        As data is pulled for each page, the results are pickled in an object. If a crash occurs,
-        it will create a save state and read from save state and resume operations from last crash.
+    def _recover(
+        self, checkpoint: SegmentCheckpoint, replay: bool
+    ) -> Generator[List[Dict[str, Any]], None, Optional[Dict[str, Any]]]:
+        """picks a checkpoint up after a crash, yielding its saved pages first when ``replay``,
+        a checkpoint left over from a run that did not crash is cleared
 
-        Refer to the nested functions of ``__load_state()`` and ``__save_state()``
+        ```python
+        manifest = yield from self._recover(checkpoint, replay)
+        ```
+
+        :param checkpoint: (SegmentCheckpoint) - checkpoint of the query
+        :param replay: (bool) - yield the pages recovered from the checkpoint
+
+        :return: the manifest of the recovered checkpoint, ``None`` to start over
+        """
+        if not (self._crashed() and checkpoint.exists()):
+            checkpoint.clear()
+            return None
+
+        manifest = checkpoint.load()
+        Red.log(
+            f"Loading state. {manifest['records']} records found in {manifest['pages']} pages"
+        )
+        if replay:
+            yield from checkpoint.segments()
+        return manifest
+
+    def _get_page(
+        self, prepared_url: str
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """request a single page of data from bcs
 
         :param prepared_url: (str) - fully prepared odata url
-        :param max_pages: (int|None) - pages to process, if ``None`` then all pages
 
-        :return:
+        :return: records of the page and the ``@odata.nextLink``, if any
+        """
+        resp = self.smart_call(self._main_session.get, prepared_url)
 
-        *Current machine has 32GB RAM, hopefully a single call to a specific object doesn't
-        cause issues, before clearing the cache.*
+        try:
+            content = resp.json()  # type: ignore
 
-        **TODO**: this method could use some tlc and optimization
+        except Exception as e:
+            Exit(
+                LEVEL_CRITICAL,
+                f"Response payload is not valid JSON: {e}\n{resp}",
+            )
+
+        r = content.get("value")  # type: ignore
+
+        # check if None or just empty list
+        if r is None:
+            Exit(
+                LEVEL_CRITICAL,
+                f"Payload did not recieve proper response: {content}",
+            )
+
+        return r, content.get("@odata.nextLink", None)  # type: ignore
+
+    def _iter_parallel(
+        self, urls: List[str], max_workers: int
+    ) -> Iterator[List[List[Dict[str, Any]]]]:
+        """fetch urls on a bounded pool of workers following the server paging of each
+
+        Results are yielded in the order of ``urls``, no more than ``max_workers`` urls are held
+        ahead of the consumer.
+
+        :param urls: (List[str]) - fully prepared odata urls
+        :param max_workers: (int) - maximum number of urls fetched at the same time
+
+        :return: generator of the pages of every url, each page is a list of records
         """
 
-        ser_file = Path(base64.urlsafe_b64encode(prepared_url.encode()).decode())
-
-        def __load_state() -> Tuple[Optional[List[str]], Optional[str]]:
-            crash_file = Path(".crash_detected")
-            if crash_file.is_file():
-                crash_file.unlink()
-                data = []
-                if ser_file.is_file():
-                    # we have a checkpoint, pick it up from there
-                    # data will be deserialized python dictionary
-                    # [{"url": "....", "records": []}, ...]
-                    with lzma.open(ser_file, "rb") as f:
-                        try:
-                            while True:
-                                data.append(pickle.load(f))
-                        except EOFError:
-                            pass
-
-                    # get last recorded url
-                    last_url: str = data[-1]["url"]
-                    all_records = [i for sublist in data for i in sublist["data"]]
-                    Red.log(
-                        f"Loading state. {len(all_records)} records found. Resuming last url: {last_url}"
-                    )
-                    return all_records, last_url
-            return None, None
-
-        def __save_state(fobj: Path, obj: Any) -> None:
-            fobj.touch(exist_ok=True)
-            with lzma.open(fobj, "a") as f:
-                pickle.dump(obj, f)
-
-        records: Dict[str, Any] = {"url": prepared_url, "data": []}
-        page = 0
-        content = None
+        def __fetch(url: str) -> List[List[Dict[str, Any]]]:
+            pages = []
+            while url:
+                r, url = self._get_page(url)  # type: ignore
+                if not r:
+                    break
+                pages.append(r)
+            return pages
+
+        pending: Deque[Future] = deque()
+        pool = ThreadPoolExecutor(max_workers=max_workers)
+        try:
+            for url in urls:
+                pending.append(pool.submit(__fetch, url))
+                if len(pending) >= max_workers:
+                    yield pending.popleft().result()
+
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
 
-        recovered_data, last_url = __load_state()
+    def iter_pages(
+        self, prepared_url: str, max_pages: Optional[int] = None, replay: bool = True
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """iterate over the data from bcs one page at a time, following ``@odata.nextLink``
+        until no more data is retrieved. Smart query, saves a checkpoint of records as it pulls data from object.
 
-        if recovered_data:
-            records["data"].extend(recovered_data)
-            prepared_url = str(last_url)
+        As data is pulled for each page, the results are written as a segment of a ``SegmentCheckpoint``.
+        If a crash occurs, the next run reads the checkpoint manifest and resumes operations from
+        the last recorded ``@odata.nextLink``. Pages recovered from the checkpoint are read back one
+        segment at a time and yielded first, unless ``replay`` is ``False``.
+
+        Refer to ``redutils.api.checkpoint.SegmentCheckpoint``
+
+        Example Usage:
+
+        ```python
+        with MyEntity(...) as bcs:
+            for records in bcs.iter_pages(bcs.url):
+                write_somewhere(records)
+        ```
+
+        :param prepared_url: (str) - fully prepared odata url
+        :param max_pages: (int|None) - pages to process, if ``None`` then all pages
+        :param replay: (bool) - yield the pages recovered from a checkpoint before resuming
+
+        :return: generator of pages, each page is a list of records
+        """
+
+        checkpoint = SegmentCheckpoint(prepared_url)
+
+        page = 0
+        total = 0
+
+        manifest = yield from self._recover(checkpoint, replay)
+        if manifest is not None:
+            total = manifest["records"]
+            prepared_url = manifest["next_link"]
+            Red.log(f"Resuming last url: {prepared_url}")
 
         if max_pages is not None:
             try:
@@ -114,41 +225,25 @@ class BCSApi(OAuthApi, IngestionTemplate):
         try:
             while True:
                 Red.log(f"Querying Page....{page}")
-                resp = self.smart_call(self._main_session.get, prepared_url)
-
-                try:
-                    content = resp.json()  # type: ignore
-
-                except Exception as e:
-                    Exit(
-                        LEVEL_CRITICAL,
-                        f"Response payload is not valid JSON: {e}\n{resp}",
-                    )
-
-                r = content.get("value")  # type: ignore
+                r, prepared_url = self._get_page(prepared_url)  # type: ignore
 
                 if not r:
-                    # check if None or just empty list
+                    # Exit(LEVEL_SUCCESS, f"No new records found....")
+                    return
 
-                    if r is None:
-                        Exit(
-                            LEVEL_CRITICAL,
-                            f"Payload did not recieve proper response: {content}",
-                        )
-                    else:
-                        # Exit(LEVEL_SUCCESS, f"No new records found....")
-                        return
+                total += len(r)
 
-                records["data"].extend(r)
+                Red.log(f"Found next link: {prepared_url}")
+                if prepared_url:
+                    # checkpoint before handing the page over, a crash while the
+                    # consumer processes it will then resume on the next page
+                    checkpoint.save(r, next_link=prepared_url)
 
-                prepared_url = content.get("@odata.nextLink", None)  # type: ignore
+                yield r
 
-                Red.log(f"Found next link: {prepared_url}")
                 if not prepared_url:
                     break
 
-                __save_state(ser_file, {"url": prepared_url, "data": r})
-
                 if max_pages is not None:
                     if max_pages - 1 == page:
                         Red.info(f"Max pages reached... aborting ingestion")
@@ -157,11 +252,9 @@ class BCSApi(OAuthApi, IngestionTemplate):
                 page += 1
 
             # we are all done.. remove checkpoint as we don't need it any longer
-            if ser_file.is_file():
-                ser_file.unlink()
+            checkpoint.clear()
 
-            Red.log(f"Finished query with {len(records['data'])} records")
-            return records["data"]
+            Red.log(f"Finished query with {total} records")
 
         except Exception as e:
             Exit(
@@ -169,6 +262,283 @@ class BCSApi(OAuthApi, IngestionTemplate):
                 f"Failed to query on url: {prepared_url} with error: {traceback.format_exc()}",
             )
 
+    def iter_windows(
+        self,
+        uri: str,
+        params: Dict[str, str],
+        field: str,
+        windows: List[Tuple[str, Optional[str]]],
+        max_workers: int = 4,
+        replay: bool = True,
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """iterate over the data from bcs fetching ranges of a field, i.e. a delta range split in time
+        windows, in parallel
+
+        Every window becomes a ``$filter`` range of ``field``, combined with any ``$filter`` in params,
+        and is fetched by a bounded pool of workers following the server paging. Windows are yielded
+        in order, each as one page, no more than ``max_workers`` windows are held ahead of the consumer.
+
+        Each window is checkpointed as a segment of a ``SegmentCheckpoint`` before it is yielded, after
+        a crash the next run resumes from the first window that was not yielded, see ``iter_pages``.
+        The checkpoint is keyed by the query, the field, the first start and the number of windows, and
+        keeps the planned windows, so a rerun planning windows up to a later time resumes the same ones.
+
+        :param uri: (str) - name of the entity
+        :param params: (Dict[str, str]) - odata params
+        :param field: (str) - field the windows range over
+        :param windows: (List[Tuple[str, str|None]]) - odata literals of the inclusive start and exclusive end
+            of every window, an end of ``None`` leaves the window open, see ``plan_windows``
+        :param max_workers: (int) - maximum number of windows fetched at the same time
+        :param replay: (bool) - yield the windows recovered from a checkpoint before resuming
+
+        :return: generator of pages, one per window, each page is a list of records
+        """
+        odata = ODataUrl(str(self.endpoint_url))
+        checkpoint = SegmentCheckpoint(
+            "\n".join(
+                [
+                    odata.parse(uri, params=params),
+                    field,
+                    windows[0][0] if windows else "",
+                    str(len(windows)),
+                ]
+            )
+        )
+        done = 0
+
+        manifest = yield from self._recover(checkpoint, replay)
+        if manifest is not None:
+            done = manifest["pages"]
+            windows = [(start, end) for start, end in manifest["windows"]]
+            Red.log(f"Resuming after {done} of {len(windows)} windows")
+
+        urls = []
+        for start, end in windows:
+            window = ODataUrl.window(field, start, end)
+            if params.get("$filter"):
+                window = f"({params['$filter']}) and ({window})"
+            urls.append(odata.parse(uri, params={**params, "$filter": window}))
+
+        Red.log(
+            f"Fetching {len(urls) - done} windows of {field} with {max_workers} workers"
+        )
+
+        for pages in self._iter_parallel(urls[done:], max_workers):
+            records = [record for page in pages for record in page]
+            checkpoint.save(records, next_link=None, windows=windows)
+            yield records
+
+        checkpoint.clear()
+
+    def iter_keyset(
+        self,
+        uri: str,
+        params: Dict[str, str],
+        key: str,
+        page_size: int = 10000,
+        max_pages: Optional[int] = None,
+        replay: bool = True,
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """iterate over the data from bcs one keyset page at a time, ordered by ``key``
+
+        Every page is requested with ``$orderby`` on ``key``, ``$top`` and a ``key gt <last key seen>``
+        ``$filter``, combined with any ``$filter`` in params, instead of a ``$skip`` offset. The server
+        seeks to the last key instead of rescanning the skipped rows, so every page costs the same
+        however deep it is. ``key`` must be unique and sortable, i.e. the ``Id`` of the entity, and
+        present in the selected properties.
+
+        Pages are checkpointed like ``iter_pages``, after a crash the next run resumes after the last
+        key recorded in the checkpoint manifest.
+
+        Example Usage:
+
+        ```python
+        with MyEntity(...) as bcs:
+            for records in bcs.iter_keyset("Workers", {"$select": "Id,Name"}, "Id", page_size=5000):
+                write_somewhere(records)
+        ```
+
+        :param uri: (str) - name of the entity
+        :param params: (Dict[str, str]) - odata params, ``$skip``, ``$top``, ``$count`` and ``$orderby`` are replaced
+        :param key: (str) - unique property the pages are ordered and sought by
+        :param page_size: (int) - records per page
+        :param max_pages: (int|None) - pages to process, if ``None`` then all pages
+        :param replay: (bool) - yield the pages recovered from a checkpoint before resuming
+
+        :return: generator of pages, each page is a list of records
+        """
+        odata = ODataUrl(str(self.endpoint_url))
+        params = {
+            k: v
+            for k, v in params.items()
+            if k not in ("$skip", "$top", "$count", "$orderby")
+        }
+        params.update({"$orderby": key, "$top": str(page_size)})
+
+        def __url(last: Any) -> str:
+            if last is None:
+                return odata.parse(uri, params=params)
+            seek = f"{key} gt {ODataUrl.literal(last)}"
+            if params.get("$filter"):
+                seek = f"({params['$filter']}) and ({seek})"
+            return odata.parse(uri, params={**params, "$filter": seek})
+
+        checkpoint = SegmentCheckpoint(__url(None))
+
+        last: Any = None
+        total = 0
+
+        manifest = yield from self._recover(checkpoint, replay)
+        if manifest is not None:
+            total = manifest["records"]
+            last = manifest.get("last_key")
+            Red.log(f"Resuming after {key} {last}")
+
+        page = 0
+        url = __url(last)
+        try:
+            while max_pages is None or page < int(max_pages):
+                Red.log(f"Querying Page....{page}")
+                records: List[Dict[str, Any]] = []
+                # servers paging below $top still send a nextLink within the page
+                link: Optional[str] = __url(last)
+                while link:
+                    url = link
+                    r, link = self._get_page(url)  # type: ignore
+                    if not r:
+                        break
+                    records.extend(r)
+
+                if not records:
+                    break
+
+                if key not in records[-1]:
+                    Exit(LEVEL_CRITICAL, f"Keyset {key} not found in records of {uri}")
+                last = records[-1][key]
+                total += len(records)
+
+                # checkpoint before handing the page over, see ``iter_pages``
+                checkpoint.save(records, next_link=None, last_key=last)
+
+                yield records
+
+                if len(records) < page_size:
+                    break
+                page += 1
+
+            checkpoint.clear()
+
+            Red.log(f"Finished query with {total} records")
+
+        except Exception as e:
+            Exit(
+                LEVEL_CRITICAL,
+                f"Failed to query on url: {url} with error: {traceback.format_exc()}",
+            )
+
+    def count(self, uri: str, params: Dict[str, str] = {}) -> int:
+        """total number of records within entity, honoring any ``$filter`` in params
+
+        :param uri: (str) - name of the entity
+        :param params: (Dict[str, str]) - odata params used for the query
+
+        :return: int
+        """
+        params = {k: v for k, v in params.items() if k not in ("$skip", "$top")}
+        url = ODataUrl(str(self.endpoint_url)).parse(
+            uri, params={**params, "$top": "0", "$count": "true"}
+        )
+
+        resp = self.smart_call(self._main_session.get, url)
+        try:
+            return int(resp.json()["@odata.count"])  # type: ignore
+        except Exception as e:
+            Exit(LEVEL_CRITICAL, f"Unable to read count from: {url}\n{e}")
+        return 0
+
+    def iter_partitions(
+        self,
+        uri: str,
+        params: Dict[str, str],
+        key: Optional[str],
+        partition_size: int = 10000,
+        max_workers: int = 4,
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """iterate over the data from bcs fetching ``$skip/$top`` partitions in parallel
+
+        The total count is read once, the entity is then split into partitions of ``partition_size``
+        records which are fetched by a bounded pool of workers sharing this object's token and session.
+        Pages are yielded in order, no more than ``max_workers`` partitions are held ahead of the consumer.
+
+        Every partition is a separate request, OData only keeps ``$skip`` offsets stable across them
+        with an ``$orderby`` on a unique property. ``key`` is appended to any ``$orderby`` in params,
+        without a key the partitions could overlap or leave gaps, so the fetch exits instead.
+
+        Partitions are not checkpointed, a crash restarts the whole fetch.
+
+        :param uri: (str) - name of the entity
+        :param params: (Dict[str, str]) - odata params, an existing ``$skip`` and ``$top`` bound the partitions
+        :param key: (str|None) - unique property ordering the partitions, i.e. ``Id``
+        :param partition_size: (int) - records per partition
+        :param max_workers: (int) - maximum number of partitions fetched at the same time
+
+        :return: generator of pages, each page is a list of records
+        """
+        if not key:
+            Exit(
+                LEVEL_CRITICAL,
+                "Parallel partitions need a unique key to order by, declare __keyset__ or pass keyset",
+            )
+
+        base_params = {
+            k: v for k, v in params.items() if k not in ("$skip", "$top", "$count")
+        }
+        orderby = [o for o in base_params.get("$orderby", "").split(",") if o]
+        if key not in (o.split()[0] for o in orderby):
+            base_params["$orderby"] = ",".join([*orderby, str(key)])
+        start = int(params.get("$skip", 0))
+        total = max(self.count(uri, base_params) - start, 0)
+        if params.get("$top") is not None:
+            total = min(total, int(params["$top"]))
+        end = start + total
+
+        odata = ODataUrl(str(self.endpoint_url))
+        urls = [
+            odata.parse(
+                uri,
+                params={
+                    **base_params,
+                    "$skip": str(skip),
+                    "$top": str(min(partition_size, end - skip)),
+                },
+            )
+            for skip in range(start, end, partition_size)
+        ]
+        Red.log(
+            f"Fetching {total} records in {len(urls)} partitions with {max_workers} workers"
+        )
+
+        for pages in self._iter_parallel(urls, max_workers):
+            yield from pages
+
+    def query(self, prepared_url: str, max_pages: Optional[int] = None) -> Any:
+        """query the data from bcs, and continue until no more data is retrieved
+
+        Collects every page from ``iter_pages()`` into a single list of records, refer to
+        ``iter_pages()`` for the checkpoint and resume behavior. Prefer ``iter_pages()`` on
+        large entities as this holds all records in memory.
+
+        :param prepared_url: (str) - fully prepared odata url
+        :param max_pages: (int|None) - pages to process, if ``None`` then all pages
+
+        :return: list of records, ``None`` if no records were found
+        """
+        records: List[Dict[str, Any]] = []
+        for page in self.iter_pages(prepared_url, max_pages=max_pages):
+            records.extend(page)
+
+        return records or None
+
 
 class BaseEntity(BCSApi):
     """All BCS tables are pendantically `Entities`. Any new or existing entities should
@@ -241,6 +611,9 @@ class BaseEntity(BCSApi):
 
     __entity_name__: str | None = None
     __headers__: Tuple[str, ...] = ()
+    __expand__: Tuple[str, ...] = ()
+    __complex__: Tuple[str, ...] = ()
+    __keyset__: str | None = None
 
     def __init__(
         self,
@@ -252,6 +625,14 @@ class BaseEntity(BCSApi):
         delta: Tuple[str, str] | None = None,
         force_full_reload: bool = False,
         save_format: str = "csv",
+        max_workers: int = 1,
+        partition_size: int = 10000,
+        chunk_rows: int | None = None,
+        select_pushdown: bool = False,
+        watermark: Tuple[str, str] | None = None,
+        backend: str | None = None,
+        windows: int | None = None,
+        keyset: str | None = None,
     ):
         """Base Entity class for any BCS NextGen table. Inherit this class for finer control of ingestion.
 
@@ -259,6 +640,10 @@ class BaseEntity(BCSApi):
 
         * `__entity_name__: (str|None)` Name of the entity (table) from BCS NextGen APIs
         * `__headers__: (Tuple[str, ...])` A tuple of headers expected from desired entity
+        * `__expand__: (Tuple[str, ...])` Navigation properties of the entity referenced by headers, i.e. ``Owner`` for ``Owner_Name``
+        * `__complex__: (Tuple[str, ...])` Complex-typed properties of the entity referenced by headers, i.e. ``EntityKey`` for ``EntityKey_EntitySetName``
+        * `__keyset__: (str|None)` Unique, sortable property to page by with ``key gt <last key>`` instead of ``$skip``,
+          and to order parallel partitions by, i.e. ``Id``
 
 
         :param client_id: client_id to connect to API
@@ -269,6 +654,25 @@ class BaseEntity(BCSApi):
         :param delta: : Delta parameter name. Defaults to None.
         :param force_full_reload:  Perform full reload of data. Defaults to False.
         :param save_format:  Choose format to save data after ingestion. Defaults to "csv".
+        :param max_workers:  Partitions fetched in parallel, ordered by ``keyset`` which is then required, ``1`` follows
+            server paging serially. Defaults to 1.
+        :param partition_size:  Records per ``$skip/$top`` partition when ``max_workers > 1``, or per page in keyset
+            mode. Defaults to 10000.
+        :param chunk_rows:  Write the output file incrementally every ``chunk_rows`` records, ``None`` builds one dataframe. Defaults to None.
+        :param select_pushdown:  Request only the properties of ``__headers__`` with ``$select``/``$expand``,
+            unless already in odata_params. Headers are selected as is, declare nested ones in ``__complex__`` or
+            ``__expand__``. Defaults to False.
+        :param watermark:  Delta field name and Red parameter name holding its high-watermark. The delta starts from the
+            parameter value, and the maximum of the field over the extracted data is written back after a successful run.
+            Overrides delta. Defaults to None.
+        :param backend:  Dataframe library building and writing the data, ``pandas`` or ``polars``. Defaults to
+            the ``backend`` class attribute, ``pandas``.
+        :param windows:  Split a delta load into this many time windows, from the delta value until now, fetched
+            ``max_workers`` at a time and checkpointed window by window. The delta field must hold a date or
+            a date and time. Defaults to None, one filter over the whole delta range.
+        :param keyset:  Unique property to page by, ordered with ``$orderby`` and sought with ``$filter`` instead of
+            ``$skip``, see ``iter_keyset``. With ``max_workers > 1`` the parallel partitions are ordered by it instead.
+            Defaults to the ``__keyset__`` class attribute, None for server paging.
         """
         if self.__entity_name__ is None:
             Exit(
@@ -279,18 +683,45 @@ class BaseEntity(BCSApi):
         if not self.__headers__:
             Exit(LEVEL_ERROR, "No supplied headers...")
 
-        super().__init__(client_id, client_secret)
+        super().__init__(client_id, client_secret, pool_maxsize=max(10, max_workers))
 
         self._params = {"$skip": "0", "$count": "true", **odata_params}
 
+        if select_pushdown and "$select" not in odata_params:
+            for k, v in ODataUrl.select(
+                self.__headers__, self.__expand__, self.__complex__
+            ).items():
+                self._params.setdefault(k, v)
+
+        self._keyset = keyset or self.__keyset__
+        if self._keyset:
+            # pages are sought by the last key, it must come back with the records
+            self._select_also(self._keyset)
+        if watermark:
+            # the watermark is read from the records, even when not a header
+            self._select_also(watermark[0])
+
         self._today = date.today().strftime("%Y-%m-%d")
 
         self._load_dir = load_dir
         self._delta = delta
         self._force_full_reload = force_full_reload
+        self._max_workers = max_workers
+        self._partition_size = partition_size
+        self._chunk_rows = chunk_rows
+        self._unknown_columns: Set[str] = set()
+        self._row_count = 0
+        self._watermark = watermark
+        self._watermark_value: Any = None
+        self._windows = windows
+        self._window_plan: List[Tuple[str, Optional[str]]] = []
 
         self._repo_db = repo_db
 
+        if backend is not None:
+            self.backend = backend
+        self._frames = self.frames
+
         if save_format not in self.valid_save_formats:
             Exit(
                 LEVEL_ERROR,
@@ -302,6 +733,20 @@ class BaseEntity(BCSApi):
             / f"{self.__entity_name__}_{time.strftime('%Y%m%d')}.{self._save_format}"
         )
 
+    def _select_also(self, name: str) -> None:
+        """adds the property of a flattened name to ``$select``, if properties are selected"""
+        if "$select" not in self._params:
+            return
+        selected = self._params["$select"].split(",")
+        prop = ODataUrl.select((name,), complex_types=self.__complex__)["$select"]
+        if prop not in selected:
+            self._params["$select"] = ",".join([*selected, prop])
+
+    @property
+    def row_count(self) -> int:
+        """number of records written by the last extraction"""
+        return self._row_count
+
     @property
     def valid_save_formats(self) -> List[str]:
         return ["csv", "parquet"]
@@ -314,8 +759,47 @@ class BaseEntity(BCSApi):
             params=self._params,
         )
 
+    def pages(self) -> Iterator[List[Dict[str, Any]]]:
+        """pages of records for the entity, fetched by time window when planned, in parallel partitions
+        when ``max_workers`` is greater than 1, by key in keyset mode, otherwise by following the
+        server paging
+
+        :return: generator of pages, each page is a list of records
+        """
+        if self._window_plan:
+            field_name, _ = self._delta  # type: ignore
+            return self.iter_windows(
+                str(self.__entity_name__),
+                {k: v for k, v in self._params.items() if k != "$filter"},
+                field_name,
+                self._window_plan,
+                max_workers=self._max_workers,
+            )
+        if self._max_workers > 1:
+            return self.iter_partitions(
+                str(self.__entity_name__),
+                self._params,
+                self._keyset,
+                partition_size=self._partition_size,
+                max_workers=self._max_workers,
+            )
+        if self._keyset:
+            return self.iter_keyset(
+                str(self.__entity_name__),
+                self._params,
+                self._keyset,
+                page_size=self._partition_size,
+            )
+        return self.iter_pages(self.url)
+
     def pre_extract(self) -> None:
         """Pre extration logic override this method to change default behavior"""
+        if self._watermark:
+            field_name, parameter = self._watermark
+            field_value = self._read_parameter(parameter).value
+            Red.log(f"Watermark {parameter}: {field_value}")
+            self._delta = (field_name, field_value) if field_value else None
+
         if self._delta:
             if self._params.get("$filter"):
                 del self._params["$filter"]
@@ -328,10 +812,85 @@ class BaseEntity(BCSApi):
         if self._force_full_reload:
             if self._params.get("$filter"):
                 del self._params["$filter"]
+        elif self._windows and self._delta:
+            self._window_plan = self._plan_windows(str(self._delta[1]))
+
+    def _plan_windows(self, value: str) -> List[Tuple[str, Optional[str]]]:
+        """``windows`` ranges from a delta value until now, as odata literals, the last one left open"""
+        try:
+            start: date | datetime = datetime.fromisoformat(value)
+        except ValueError:
+            Red.warn(f"Delta value {value} is not a date, not splitting in windows")
+            return []
+
+        if len(value) == len("YYYY-MM-DD"):
+            start = start.date()  # type: ignore
+            end: date | datetime = date.today() + timedelta(days=1)
+        else:
+            end = datetime.now(start.tzinfo)  # type: ignore
+
+        def __literal(bound: date | datetime) -> str:
+            if isinstance(bound, datetime):
+                return bound.isoformat(timespec="seconds").replace("+00:00", "Z")
+            return bound.isoformat()
+
+        plan: List[Tuple[str, Optional[str]]] = [
+            (__literal(lo), __literal(hi))
+            for lo, hi in plan_windows(start, end, self._windows or 1)
+        ]
+        if plan:
+            # records created after planning still belong to the last window
+            plan[-1] = (plan[-1][0], None)
+        Red.log(f"Delta split in {len(plan)} windows from {value}")
+        return plan
+
+    def project(self, records: List[Dict[str, Any]]) -> pd.DataFrame:
+        """flatten records into a dataframe projected onto ``__headers__``
+
+        Only the values named by ``__headers__`` are pulled from the records, see ``compile_headers()``.
+        Unknown columns are ignored with a warning, the first time they are seen, and
+        missing columns are filled with a default null value.
+
+        :param records: (List[Dict[str, Any]]) - records as returned by the api
+
+        :return: dataframe of the selected backend with exactly the columns of ``__headers__``
+        """
+        self._inspect(records)
+        return self._frames.project(records, self.__headers__)
+
+    def _inspect(self, records: List[Dict[str, Any]]) -> None:
+        """tracks the watermark and warns about unknown columns of records about to be projected"""
+        flattener = compile_headers(self.__headers__)
+
+        if self._watermark:
+            self._track_watermark(records)
+
+        unknown_columns = flattener.unknown(records)
+
+        if unknown_columns.difference(self._unknown_columns):
+            errmsg = f"columns mismatch from provided and retrieved: {unknown_columns}"
+            Red.warn(errmsg)
+            self._unknown_columns.update(unknown_columns)
+
+    def iter_frames(self) -> Iterator[pd.DataFrame]:
+        """projected dataframes of at least ``chunk_rows`` records, built page by page
+
+        :return: generator of dataframes
+        """
+        chunk_rows = self._chunk_rows or 1
+        buffer: List[Dict[str, Any]] = []
+        for page in self.pages():
+            buffer.extend(page)
+            if len(buffer) >= chunk_rows:
+                yield self.project(buffer)
+                buffer = []
+
+        if buffer:
+            yield self.project(buffer)
 
     def extract(
         self, apply_func: Callable[[pd.DataFrame], pd.DataFrame] | None = None
-    ) -> pd.DataFrame:
+    ) -> pd.DataFrame | None:
         """The extraction process for defined entity
 
         Example Usage:
@@ -348,57 +907,104 @@ class BaseEntity(BCSApi):
             ...
         ```
 
-        :param apply_func:  Provide a custom function to handle any post-processing to data. Defaults to None.
+        When ``chunk_rows`` is set the data is written incrementally instead, see ``extract_chunks()``.
 
-        :return: post-processed data from entity as a pandas dataframe
-        """
-        data = self.query(self.url)
-        if data is None:
-            df = pd.DataFrame(columns=self.__headers__)
-        else:
-            df = pd.json_normalize(data, sep="_")
+        A ``transform_func`` set on the entity runs before ``apply_func``, in ``transform_workers``
+        processes, see ``IngestionTemplate``.
 
-        got = set(df.columns)
-        want = set(self.__headers__)
+        :param apply_func:  Provide a custom function to handle any post-processing to data. Defaults to None.
 
-        unknown_columns = got.difference(want)
+        :return: post-processed data from entity as a pandas dataframe, ``None`` when written in chunks
+        """
+        self._unknown_columns = set()
 
-        if unknown_columns:
-            errmsg = f"columns mismatch from provided and retrieved: {unknown_columns}"
-            df.drop(columns=unknown_columns, inplace=True)
-            Red.warn(errmsg)
+        if self._chunk_rows:
+            return self.extract_chunks(apply_func)
 
-        # add any missing columns with default null value
-        for column in want:
-            if column not in df.columns:
-                df[column] = np.NaN
+        data = [record for page in self.pages() for record in page]
+        df = self.transform(self.project(data))
 
-        try:
-            df = df[list(self.__headers__)]
-        except KeyError as e:
-            Exit(LEVEL_CRITICAL, f"Key Error: Necessary columns not found\n{e}")
+        self._row_count = len(df)
 
         if apply_func:
             return apply_func(df)
 
-        match self._save_format:
-            case "csv":
-                df.to_csv(self._output_file, index=False, header=True)
-            case "parquet":
-                df.to_parquet(
-                    self._output_file,
-                    index=False,
-                    engine="pyarrow",
-                    compression="snappy",
-                )
-            case _:
-                Exit(LEVEL_CRITICAL, "Unknown save format")
+        self._frames.write(df, self._output_file, self._save_format)
 
         Red.info(f"Writing {len(df)} records to: {self._output_file.absolute()}")
 
         return df
 
-    def post_extract(self, df: pd.DataFrame) -> None:
+    def extract_chunks(
+        self, apply_func: Callable[[pd.DataFrame], pd.DataFrame] | None = None
+    ) -> None:
+        """Incremental extraction process for defined entity, memory stays bound to ``chunk_rows``
+
+        Each chunk of at least ``chunk_rows`` records is projected onto ``__headers__``, passed
+        through ``transform_func`` and ``apply_func`` if provided, and appended to the output file,
+        as rows of a csv or a row group of a parquet file.
+
+        :param apply_func:  Provide a custom function to handle any post-processing to each chunk. Defaults to None.
+
+        :return: None, the data is only available in the output file
+        """
+        with ChunkedFileWriter(self._output_file, self._save_format) as writer:
+            for df in self.transform_chunks(self.iter_frames()):
+                if apply_func:
+                    df = apply_func(df)
+                writer.write(df)
+
+            if not writer.chunks:
+                writer.write(self.project([]))
+
+        self._row_count = writer.rows
+        Red.info(f"Writing {writer.rows} records to: {self._output_file.absolute()}")
+
+    def save_watermark(self) -> None:
+        """writes the maximum of the watermark field seen by the extraction back to its Red parameter"""
+        if not self._watermark:
+            return
+
+        field_name, parameter = self._watermark
+        if self._watermark_value is None:
+            if self._row_count:
+                Red.warn(
+                    f"No values of {field_name} in {self._row_count} records, watermark {parameter} not updated"
+                )
+            return
+
+        param = self._read_parameter(parameter)
+        param.value = str(self._watermark_value)
+
+        if hasattr(self._repo_db, "params"):
+            self._repo_db.params.set(parameter, (param.value, param.desc))
+        else:
+            self._repo_db.ws_parameter_write(param)
+
+        Red.log(f"Watermark {parameter} set to: {param.value}")
+
+    def _read_parameter(self, parameter: str) -> RedParameter:
+        # accept either a WherescapeManager or the bare WherescapeProtocol
+        if hasattr(self._repo_db, "params"):
+            return self._repo_db.params.get(parameter, refresh=True)
+        return self._repo_db.ws_parameter_read(parameter, refresh=True)
+
+    def _track_watermark(self, records: List[Dict[str, Any]]) -> None:
+        field_name, _ = self._watermark  # type: ignore
+        values = [
+            v
+            for v in compile_headers((field_name,)).columns(records)[field_name]
+            if v is not None and v == v  # drop missing and NaN
+        ]
+        if values:
+            high = max(values)
+            if self._watermark_value is None or high > self._watermark_value:
+                self._watermark_value = high
+
+    def post_process(self, df: pd.DataFrame | None) -> None:
+        """post processing logic, called with the result of ``extract()`` before ``post_extract()``"""
+
+    def post_extract(self, df: pd.DataFrame | None) -> None:
         """post extraction logic. Use this to block for any clean up and parameter changes in red"""
 
     def run(self):
@@ -407,3 +1013,117 @@ class BaseEntity(BCSApi):
         df = self.extract()
         self.post_process(df)
         self.post_extract(df)
+        self.save_watermark()
+
+
+class BCSOrchestrator:
+    """Runs many BCS entities concurrently, sharing one token and connection pool.
+
+    Every entity is a ``BaseEntity`` subclass, instantiated with the shared keyword arguments updated
+    with its own, then ran on a pool of at most ``max_concurrency`` threads. Timing and record counts
+    of each entity are logged to ``Red`` as they complete.
+
+    The ``.crash_detected`` marker is read once per run, and every entity resumes its checkpoint
+    when it was found.
+
+    Example Usage:
+
+    ```python
+    with BCSOrchestrator(
+        client_id,
+        client_secret,
+        entities=[
+            ClientOwnerships,
+            (Clients, {"delta": ("UpdatedDate", "2024-01-01")}),
+        ],
+        max_concurrency=4,
+        repo_db=db,
+        load_dir=Path(db["load_bcs"].value),
+        chunk_rows=50000,
+    ) as orchestrator:
+        stats = orchestrator.run()
+
+    Exit(LEVEL_SUCCESS, "Success")
+    ```
+    """
+
+    def __init__(
+        self,
+        client_id: str,
+        client_secret: str,
+        entities: List[Type[BaseEntity] | Tuple[Type[BaseEntity], Dict[str, Any]]],
+        max_concurrency: int = 4,
+        **entity_kwargs: Any,
+    ) -> None:
+        """
+        :param client_id: client_id to connect to API
+        :param client_secret: client_secret to connect to API
+        :param entities: entity classes, or tuples of entity class and its own keyword arguments
+        :param max_concurrency: maximum number of entities ran at the same time. Defaults to 4.
+        :param entity_kwargs: keyword arguments passed to every entity, i.e. ``repo_db`` and ``load_dir``
+        """
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.max_concurrency = max_concurrency
+        self._entities = [e if isinstance(e, tuple) else (e, {}) for e in entities]
+        self._entity_kwargs = entity_kwargs
+        workers = max(
+            [entity_kwargs.get("max_workers", 1)]
+            + [kwargs.get("max_workers", 1) for _, kwargs in self._entities]
+        )
+        self._api = BCSApi(
+            client_id, client_secret, pool_maxsize=max(10, max_concurrency * workers)
+        )
+
+    def __enter__(self) -> "BCSOrchestrator":
+        self._api.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self._api.__exit__(exc_type, exc_value, traceback)
+
+    def run(self) -> Dict[str, Dict[str, Any]]:
+        """run every entity, stops scheduling new entities on the first failure
+
+        :return: records and seconds taken, per entity name
+        """
+        stats: Dict[str, Dict[str, Any]] = {}
+        start = time.perf_counter()
+
+        # read once, the first entity to start would otherwise consume it for all of them
+        resume = self._api._crashed()
+
+        pool = ThreadPoolExecutor(max_workers=self.max_concurrency)
+        try:
+            futures = [
+                pool.submit(self._run_entity, entity, kwargs, resume)
+                for entity, kwargs in self._entities
+            ]
+            for future in as_completed(futures):
+                name, rows, elapsed = future.result()
+                stats[name] = {"rows": rows, "seconds": elapsed}
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+        Red.log(
+            f"Finished {len(stats)} entities with {sum(s['rows'] for s in stats.values())} "
+            f"records in {time.perf_counter() - start:.1f}s"
+        )
+        return stats
+
+    def _run_entity(
+        self, entity: Type[BaseEntity], kwargs: Dict[str, Any], resume: bool
+    ) -> Tuple[str, int, float]:
+        start = time.perf_counter()
+        instance = entity(
+            self.client_id, self.client_secret, **{**self._entity_kwargs, **kwargs}
+        ).share(self._api)
+        instance.resume = resume
+        instance.run()
+
+        elapsed = time.perf_counter() - start
+        Red.log(
+            f"Entity {entity.__entity_name__}: {instance.row_count} records in {elapsed:.1f}s, "
+            f"{instance.transfer_stats['bytes_received']} bytes received"
+        )
+        return str(entity.__entity_name__), instance.row_count, elapsed
@@ -1,10 +1,36 @@
-from typing import List
+import asyncio
+import json
+import traceback
+from concurrent.futures import Executor
+from contextlib import nullcontext
+from types import SimpleNamespace
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Tuple
 
 import aiohttp
+from typing_extensions import Self
 
-from ..red import Exit, LEVEL_ERROR, Red
+from ..red import Exit, LEVEL_CRITICAL, LEVEL_ERROR, Red
 from ..auth.generic import GenericToken
 from ..api.templates import AsyncIngestionTemplate
+from ..api.concurrency import slot
+
+# orjson decodes faster when available, json is the fallback
+try:
+    from orjson import loads as _loads
+except ImportError:
+    _loads = json.loads
+
+
+def decode_json(raw: bytes) -> Any:
+    """decodes a JSON payload with the fastest decoder available
+
+    Module level so it can be sent to a process pool.
+
+    :param raw: (bytes) - JSON document
+
+    :return: Any
+    """
+    return _loads(raw)
 
 
 class CleargistixBase(GenericToken, AsyncIngestionTemplate):
@@ -13,6 +39,12 @@ class CleargistixBase(GenericToken, AsyncIngestionTemplate):
 
     :param token_or_key: (str) - token or key to use for authentication
     :param server_url: (str) - url of the server to connect to
+    :param limit: (int) - connections open at once across all hosts, 0 for no limit, defaults to 100
+    :param limit_per_host: (int) - connections open at once to the same host, 0 for no limit, defaults to 0
+    :param keepalive_timeout: (float) - seconds an idle connection is kept for reuse, defaults to 30
+    :param ttl_dns_cache: (int|None) - seconds resolved addresses are cached, ``None`` caches forever, defaults to 300
+    :param decode_threshold: (int) - payload size, in bytes, from which JSON is decoded in ``decode_executor``, defaults to 1MiB
+    :param decode_executor: (Executor|None) - pool decoding large payloads off the event loop, defaults to decoding on the loop
 
     :return: (CleargistixBase) - instance of the CleargistixBase class
 
@@ -20,12 +52,111 @@ class CleargistixBase(GenericToken, AsyncIngestionTemplate):
     Ensure header includes the following key,value pair of "token=token_or_key"
 
     Automatically handles error handling when interacting with Cleargisitx API
+
+    The class owns one ``aiohttp.ClientSession``, opened when entering the async context and shared
+    by every request, so connections are reused across requests. ``run()`` opens it for the whole
+    ingestion.
+
+    Payloads are read as bytes and decoded with ``decode_json``, payloads of ``decode_threshold`` bytes
+    or more in ``decode_executor`` when one is given. A thread pool lets other requests progress
+    between decoder steps, a process pool only pays off when the decoded result is small, as it is
+    sent back pickled.
+
+    Example Usage:
+
+    ```python
+    async with Workers(token, "https://example.cleargistix.com") as src:
+        workers = await src.request("workers")
+
+    print(src.connection_stats)
+    ```
     """
 
-    def __init__(self, token_or_key: str, server_url: str) -> None:
+    def __init__(
+        self,
+        token_or_key: str,
+        server_url: str,
+        limit: int = 100,
+        limit_per_host: int = 0,
+        keepalive_timeout: float = 30,
+        ttl_dns_cache: Optional[int] = 300,
+        decode_threshold: int = 1 << 20,
+        decode_executor: Optional[Executor] = None,
+    ) -> None:
         super().__init__(token_or_key)
         self.server = server_url
         self.uri_prefix = "api"
+        self._limit = limit
+        self._limit_per_host = limit_per_host
+        self._keepalive_timeout = keepalive_timeout
+        self._ttl_dns_cache = ttl_dns_cache
+        self._decode_threshold = decode_threshold
+        self._decode_executor = decode_executor
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._connection_stats: Dict[str, int] = dict.fromkeys(
+            ("requests", "created", "reused", "dns_hits", "dns_misses"), 0
+        )
+
+    async def __aenter__(self) -> Self:
+        trace = aiohttp.TraceConfig()
+        trace.on_request_end.append(self._count("requests"))
+        trace.on_connection_create_end.append(self._count("created"))
+        trace.on_connection_reuseconn.append(self._count("reused"))
+        trace.on_dns_cache_hit.append(self._count("dns_hits"))
+        trace.on_dns_cache_miss.append(self._count("dns_misses"))
+
+        self._session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=self._limit,
+                limit_per_host=self._limit_per_host,
+                keepalive_timeout=self._keepalive_timeout,
+                use_dns_cache=True,
+                ttl_dns_cache=self._ttl_dns_cache,
+            ),
+            trace_configs=[trace],
+        )
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc_val: Optional[BaseException],
+        exc_tb: Optional[traceback.TracebackException],
+    ) -> None:
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+        stats = self.connection_stats
+        if stats["requests"]:
+            Red.log(
+                f"{stats['requests']} requests over {stats['created']} connections, "
+                f"{stats['reused']} reused"
+            )
+
+    async def _run(self) -> None:
+        """Run the ingestion process within an open session"""
+        async with self:
+            await super()._run()
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        if self._session is None:
+            Exit(LEVEL_CRITICAL, "Session not opened, use `async with` first")
+        return self._session  # type: ignore
+
+    @property
+    def connection_stats(self) -> Dict[str, int]:
+        """requests made, connections created and reused, and dns cache hits and misses of the session"""
+        return dict(self._connection_stats)
+
+    def _count(self, key: str):
+        async def _on_event(
+            session: aiohttp.ClientSession, ctx: SimpleNamespace, params: object
+        ) -> None:
+            self._connection_stats[key] += 1
+
+        return _on_event
 
     def setup(self):
         (
@@ -40,15 +171,122 @@ class CleargistixBase(GenericToken, AsyncIngestionTemplate):
     def full_url(self, uri: str):
         return f"{self.server}/{self.uri_prefix}/{uri}"
 
+    async def request(
+        self, uri, method: str = "get", verbose: bool = False, **method_kwargs
+    ) -> List[dict]:
+        """calls the api with the session of the class, see ``async_request``"""
+        return await self.async_request(
+            None, uri, method=method, verbose=verbose, **method_kwargs
+        )
+
+    async def request_many(
+        self, uris: Iterable[str], concurrency: int = 10, **method_kwargs
+    ) -> Dict[str, List[dict]]:
+        """calls many uris with at most ``concurrency`` requests in flight
+
+        Example Usage:
+
+        ```python
+        async with Assets(token, server) as src:
+            details = await src.request_many(f"assets/{id}" for id in asset_ids)
+        ```
+
+        :param uris: (Iterable[str]) - api paths, uris with ``invalid_id`` and repeated uris are dropped
+        :param concurrency: (int) - requests in flight at once, defaults to 10
+        :param method_kwargs: (**kwargs) - passed on to ``async_request``
+
+        :return: (Dict[str, List[dict]]) - the payload of every uri, in the order the uris were given
+        """
+        uris = self._unique_uris(uris)
+        results = {
+            uri: data
+            async for uri, data in self.iter_many(
+                uris, concurrency=concurrency, **method_kwargs
+            )
+        }
+        return {uri: results[uri] for uri in uris}
+
+    async def iter_many(
+        self, uris: Iterable[str], concurrency: int = 10, **method_kwargs
+    ) -> AsyncIterator[Tuple[str, List[dict]]]:
+        """calls many uris with at most ``concurrency`` requests in flight, yielding
+        payloads as soon as they arrive, in no particular order
+
+        :param uris: (Iterable[str]) - api paths, uris with ``invalid_id`` and repeated uris are dropped
+        :param concurrency: (int) - requests in flight at once, defaults to 10
+        :param method_kwargs: (**kwargs) - passed on to ``async_request``
+
+        :return: async generator of ``(uri, payload)``
+        """
+        if concurrency < 1:
+            Exit(LEVEL_ERROR, f"Invalid concurrency {concurrency}, must be at least 1")
+
+        pending: asyncio.Queue = asyncio.Queue()
+        for uri in self._unique_uris(uris):
+            pending.put_nowait(uri)
+        total = pending.qsize()
+        done: asyncio.Queue = asyncio.Queue()
+
+        async def _worker() -> None:
+            while not pending.empty():
+                uri = pending.get_nowait()
+                try:
+                    data = await self.async_request(None, uri, **method_kwargs)
+                except (Exception, SystemExit) as e:
+                    # handed over to the consumer, which stops the other workers,
+                    # cancellation is left to propagate
+                    await done.put((uri, None, e))
+                    return
+                await done.put((uri, data, None))
+
+        workers = [
+            asyncio.create_task(_worker()) for _ in range(min(concurrency, total))
+        ]
+        try:
+            for _ in range(total):
+                uri, data, error = await done.get()
+                if error is not None:
+                    raise error
+                yield uri, data
+        finally:
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+    def _unique_uris(self, uris: Iterable[str]) -> List[str]:
+        """uris without ``invalid_id`` and without repeats, in order"""
+        uris = list(uris)
+        unique = [uri for uri in dict.fromkeys(uris) if self.invalid_id not in str(uri)]
+        if len(unique) < len(uris):
+            Red.debug(f"Dropped {len(uris) - len(unique)} invalid or repeated uris")
+        return unique
+
+    async def _decode(self, raw: bytes) -> Any:
+        """decodes a payload, in ``decode_executor`` from ``decode_threshold`` bytes"""
+        if self._decode_executor is None or len(raw) < self._decode_threshold:
+            return decode_json(raw)
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._decode_executor, decode_json, raw)
+
     async def async_request(
         self,
-        session: aiohttp.ClientSession,
+        session: Optional[aiohttp.ClientSession],
         uri,
         method: str = "get",
         verbose: bool = False,
         **method_kwargs,
     ) -> List[dict]:
-        # async with aiohttp.ClientSession() as session:
+        """
+        :param session: (ClientSession|None) - session to call with, ``None`` for the session of the class
+        :param uri: (str) - api path, appended to the server url
+        :param method: (str) - HTTP method, defaults to ``get``
+        :param verbose: (bool) - log the call, defaults to False
+        :param method_kwargs: (**kwargs) - key-value pairs valid for ``aiohttp.ClientSession.request``
+
+        :return: (List[dict]) - the ``json`` payload of the response
+        """
+        session = session or self.session
 
         if "timeout" not in method_kwargs:
             if verbose:
@@ -56,11 +294,14 @@ class CleargistixBase(GenericToken, AsyncIngestionTemplate):
             method_kwargs["timeout"] = 60
         if verbose:
             Red.debug(f"Calling {method} with url: {uri} and params: {method_kwargs}")
-        async with session.request(
+        async with self.rate_limiter or nullcontext(), slot(
+            self.concurrency
+        ) as held, session.request(
             method, f"{self.full_url(uri)}", headers=self.headers, **method_kwargs
         ) as response:
+            held.status = response.status
             response.raise_for_status()
-            resp = await response.json()
+            resp = await self._decode(await response.read())
             if resp.get("IsSuccess") is not True:
                 Exit(
                     LEVEL_ERROR,
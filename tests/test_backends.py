@@ -0,0 +1,40 @@
+import math
+
+from redutils.api.backends import PandasBackend, PolarsBackend
+
+RECORDS = [
+    {"Id": 1, "Pct": 100, "Code": 1},
+    {"Id": 2, "Pct": 33.5, "Code": "x"},
+    {"Id": 3},
+]
+HEADERS = ("Id", "Pct", "Code")
+
+
+def values(column):
+    return [None if isinstance(v, float) and math.isnan(v) else v for v in column]
+
+
+def test_polars_mixed_numbers_match_pandas():
+    pandas = PandasBackend().project(RECORDS, HEADERS)
+    polars = PolarsBackend().project(RECORDS, HEADERS)
+
+    assert polars["Pct"].to_list() == [100.0, 33.5, None]
+    assert polars["Pct"].to_list() == values(pandas["Pct"].tolist())
+
+
+def test_polars_mixed_types_are_kept_as_strings():
+    pandas = PandasBackend().project(RECORDS, HEADERS)
+    polars = PolarsBackend().project(RECORDS, HEADERS)
+
+    assert polars["Code"].to_list() == ["1", "x", None]
+    assert polars["Code"].to_list() == [
+        None if v is None else str(v) for v in values(pandas["Code"].tolist())
+    ]
+
+
+def test_polars_nested_lists_of_mixed_items_are_not_truncated():
+    records = [{"Id": 1, "Tags": [1]}, {"Id": 2, "Tags": [2.5]}]
+
+    polars = PolarsBackend().project(records, ("Id", "Tags"))
+
+    assert polars["Tags"].to_list() == ["[1]", "[2.5]"]
@@ -0,0 +1,155 @@
+import re
+import urllib.parse
+
+from datetime import date, timedelta
+
+import pytest
+
+from redutils.services.bcs import BaseEntity
+
+ROWS = [{"Id": i, "Name": f"n{i}"} for i in range(25)]
+SERVER_PAGE = 10
+
+
+class _Response:
+    def __init__(self, payload):
+        self.status_code = 200
+        self.headers = {}
+        self._payload = payload
+
+    def json(self):
+        return self._payload
+
+
+def serve(url):
+    """answers an odata query over ``ROWS``, ordered by ``Id``, paged by ``SERVER_PAGE``"""
+    base, _, query = url.partition("?")
+    params = dict(urllib.parse.parse_qsl(query))
+
+    rows = ROWS
+    for last in re.findall(r"Id gt (\d+)", params.get("$filter", "")):
+        rows = [r for r in rows if r["Id"] > int(last)]
+    for low in re.findall(r"Id ge (\d+)", params.get("$filter", "")):
+        rows = [r for r in rows if r["Id"] >= int(low)]
+    for high in re.findall(r"Id lt (\d+)", params.get("$filter", "")):
+        rows = [r for r in rows if r["Id"] < int(high)]
+
+    skip = int(params.get("$skip", 0))
+    end = len(rows) if "$top" not in params else skip + int(params["$top"])
+    payload = {"value": rows[skip : min(end, skip + SERVER_PAGE)]}
+    if params.get("$count") == "true":
+        payload["@odata.count"] = len(rows)
+    if skip + SERVER_PAGE < min(end, len(rows)):
+        params["$skip"] = str(skip + SERVER_PAGE)
+        if "$top" in params:
+            params["$top"] = str(end - skip - SERVER_PAGE)
+        payload["@odata.nextLink"] = (
+            base + "?" + "&".join(f"{k}={v}" for k, v in params.items())
+        )
+    return _Response(payload)
+
+
+class Workers(BaseEntity):
+    __entity_name__ = "Workers"
+    __headers__ = ("Id", "Name")
+
+    def __init__(self, *args, **kwargs):
+        super().__init__("client_id", "client_secret", None, *args, **kwargs)
+        self.calls = []
+
+    def smart_call(self, func, url, **params):
+        self.calls.append(url)
+        return serve(url)
+
+
+@pytest.fixture(autouse=True)
+def workdir(tmp_path, monkeypatch):
+    # checkpoints and the crash marker live in the working directory
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+def ids(pages):
+    return [record["Id"] for page in pages for record in page]
+
+
+def test_partitions_are_ordered_by_key():
+    entity = Workers(max_workers=3, partition_size=7, keyset="Id")
+
+    assert ids(entity.pages()) == list(range(25))
+    partitions = [url for url in entity.calls if "$skip=" in url]
+    assert partitions
+    assert all("$orderby=Id" in url for url in partitions)
+
+
+def test_partitions_without_key_exit():
+    entity = Workers(max_workers=3, partition_size=7)
+
+    with pytest.raises(SystemExit):
+        list(entity.pages())
+
+
+def test_windows_are_yielded_in_order():
+    entity = Workers()
+    windows = [("0", "12"), ("12", "13"), ("13", None)]
+
+    pages = list(entity.iter_windows("Workers", {}, "Id", windows, max_workers=2))
+
+    # one page per window, server paging followed within a window
+    assert [ids([page]) for page in pages] == [
+        list(range(12)),
+        [12],
+        list(range(13, 25)),
+    ]
+
+
+def test_plan_windows_date_only():
+    start = date.today() - timedelta(days=3)
+    entity = Workers(windows=3)
+
+    plan = entity._plan_windows(start.isoformat())
+
+    assert plan == [
+        (start.isoformat(), (start + timedelta(days=1)).isoformat()),
+        (
+            (start + timedelta(days=1)).isoformat(),
+            (start + timedelta(days=2)).isoformat(),
+        ),
+        ((start + timedelta(days=2)).isoformat(), None),
+    ]
+
+
+def test_plan_windows_timezone_aware():
+    entity = Workers(windows=3)
+
+    plan = entity._plan_windows("2024-01-01T00:00:00+00:00")
+
+    assert len(plan) == 3
+    assert plan[0][0] == "2024-01-01T00:00:00Z"
+    assert [end for _, end in plan[:-1]] == [start for start, _ in plan[1:]]
+    assert all(start.endswith("Z") for start, _ in plan)
+    # records created after planning still belong to the last window
+    assert plan[-1][1] is None
+
+
+def test_plan_windows_not_a_date():
+    assert Workers(windows=3)._plan_windows("abc") == []
+
+
+def test_keyset_resumes_after_last_key(workdir):
+    entity = Workers()
+    pages = entity.iter_keyset("Workers", {}, "Id", page_size=10)
+    assert ids([next(pages)]) == list(range(10))
+    # the consumer crashes after the first page, its checkpoint is left on disk
+    pages.close()
+
+    (workdir / ".crash_detected").touch()
+    resumed = Workers()
+    remaining = list(
+        resumed.iter_keyset("Workers", {}, "Id", page_size=10, replay=False)
+    )
+
+    assert ids(remaining) == list(range(10, 25))
+    assert all("Id gt " in url for url in resumed.calls)
+    assert "Id gt 9" in resumed.calls[0]
+    assert not (workdir / ".crash_detected").exists()
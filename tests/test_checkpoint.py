@@ -0,0 +1,28 @@
+from redutils.api.checkpoint import SegmentCheckpoint
+
+
+def test_round_trip_records_with_different_keys(tmp_path):
+    checkpoint = SegmentCheckpoint("https://example/api/workers", root=tmp_path)
+    page = [
+        {"Id": 1, "Name": "a"},
+        {"Id": 2, "Name": "b", "Owner": {"Name": "x"}},
+    ]
+    checkpoint.save(page, next_link="https://example/api/workers?$skip=2")
+
+    resumed = SegmentCheckpoint("https://example/api/workers", root=tmp_path)
+    assert resumed.exists()
+    assert resumed.load()["records"] == 2
+    assert list(resumed.segments()) == [
+        [
+            {"Id": 1, "Name": "a", "Owner": None},
+            {"Id": 2, "Name": "b", "Owner": {"Name": "x"}},
+        ]
+    ]
+
+
+def test_round_trip_mixed_types_as_json(tmp_path):
+    checkpoint = SegmentCheckpoint("https://example/api/workers", root=tmp_path)
+    page = [{"Id": 1, "Value": "a"}, {"Id": 2, "Value": {"Name": "x"}}]
+    checkpoint.save(page, next_link=None)
+
+    assert list(checkpoint.segments()) == [page]
@@ -0,0 +1,81 @@
+import time
+
+import pytest
+
+from redutils.api.concurrency import AdaptiveConcurrency, slot
+
+
+def complete(controller, status=200, latency=0.1):
+    controller.acquire()
+    controller.release(time.monotonic() - latency, status)
+
+
+def test_limit_increases_after_a_healthy_window():
+    controller = AdaptiveConcurrency(initial=2, max_limit=3)
+
+    complete(controller)
+    assert controller.limit == 2
+    complete(controller)
+    assert controller.limit == 3
+
+    for _ in range(10):
+        complete(controller)
+    assert controller.limit == 3
+
+
+def test_burst_of_throttled_responses_decreases_once():
+    controller = AdaptiveConcurrency(initial=8)
+    started = [controller.acquire() for _ in range(4)]
+
+    for start in started:
+        controller.release(start, 429)
+
+    assert controller.limit == 4
+    assert controller.stats["overloads"] == 1
+    assert controller.in_flight == 0
+
+
+def test_throttled_response_after_a_decrease_decreases_again():
+    controller = AdaptiveConcurrency(initial=8)
+
+    for _ in range(2):
+        # started after the previous decrease, it saw the lowered limit
+        controller.release(controller.acquire(), 429)
+
+    assert controller.limit == 2
+
+
+def test_slot_without_response_counts_as_failed():
+    controller = AdaptiveConcurrency(initial=4)
+
+    with pytest.raises(ConnectionError):
+        with slot(controller):
+            raise ConnectionError()
+
+    assert controller.limit == 2
+    assert controller.in_flight == 0
+
+
+def test_slot_with_response_is_judged_by_its_status():
+    controller = AdaptiveConcurrency(initial=4)
+
+    with pytest.raises(ValueError):
+        with slot(controller) as held:
+            held.status = 404
+            raise ValueError("not found")
+
+    assert controller.limit == 4
+    assert controller.stats["overloads"] == 0
+    assert controller.in_flight == 0
+
+
+def test_slot_without_controller_is_a_no_op():
+    with slot(None) as held:
+        held.status = 200
+
+
+def test_invalid_limits_raise():
+    with pytest.raises(ValueError):
+        AdaptiveConcurrency(initial=0)
+    with pytest.raises(ValueError):
+        AdaptiveConcurrency(decrease=1.5)
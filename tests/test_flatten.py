@@ -0,0 +1,52 @@
+import pandas as pd
+
+from redutils.api.backends import PandasBackend
+from redutils.api.flatten import compile_headers
+
+RECORDS = [
+    {"Id": 1, "EntityKey": None, "Empty": {}},
+    {
+        "Id": 2,
+        "EntityKey": {"EntitySetName": "x", "Surprise": 1},
+        "Custom_Field": "c",
+        "Empty": {},
+    },
+    {"Id": 3, "Owner": {"Name": "o", "Tags": [1, 2]}, "EntityKey": {}},
+    {},
+]
+HEADERS = (
+    "Id",
+    "EntityKey",
+    "EntityKey_EntitySetName",
+    "Custom_Field",
+    "Owner_Name",
+    "Missing",
+)
+
+
+def test_project_matches_json_normalize():
+    expected = pd.json_normalize(RECORDS, sep="_").reindex(columns=list(HEADERS))
+
+    pd.testing.assert_frame_equal(
+        PandasBackend().project(RECORDS, HEADERS), expected, check_dtype=False
+    )
+
+
+def test_unknown_matches_json_normalize():
+    normalized = set(pd.json_normalize(RECORDS, sep="_").columns)
+
+    unknown = compile_headers(HEADERS).unknown(RECORDS)
+
+    assert unknown == normalized.difference(HEADERS)
+    assert unknown == {"EntityKey_Surprise", "Owner_Tags"}
+
+
+def test_unknown_nested_keys_behind_the_same_layout():
+    records = [
+        {"Id": 1, "EntityKey": None},
+        {"Id": 2, "EntityKey": {"EntitySetName": "x", "Surprise": 1}},
+    ]
+
+    unknown = compile_headers(("Id", "EntityKey_EntitySetName")).unknown(records)
+
+    assert unknown == {"EntityKey", "EntityKey_Surprise"}
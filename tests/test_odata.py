@@ -0,0 +1,38 @@
+from redutils.api.odata import ODataUrl
+
+
+def test_select_keeps_underscores_in_flat_properties():
+    params = ODataUrl.select(
+        ("Id", "Custom_Field", "EntityKey_EntitySetName", "Owner_Name"),
+        expand=("Owner",),
+        complex_types=("EntityKey",),
+    )
+    assert params == {
+        "$select": "Id,Custom_Field,EntityKey",
+        "$expand": "Owner($select=Name)",
+    }
+
+
+def test_literal_quotes_strings():
+    assert ODataUrl.literal("O'Brien") == "'O''Brien'"
+    assert ODataUrl.literal("Smith") == "'Smith'"
+    assert ODataUrl.literal("42") == "'42'"
+
+
+def test_literal_keeps_guids_and_dates():
+    guid = "3F2504E0-4F89-11D3-9A0C-0305E82C3301"
+    assert ODataUrl.literal(guid) == guid
+    assert ODataUrl.literal("2024-01-01") == "2024-01-01"
+    assert ODataUrl.literal("2024-01-01T08:00:00Z") == "2024-01-01T08:00:00Z"
+    assert (
+        ODataUrl.literal("2024-01-01T08:00:00.5+02:00") == "2024-01-01T08:00:00.5+02:00"
+    )
+    assert ODataUrl.literal("2024-01-01 and 1") == "'2024-01-01 and 1'"
+
+
+def test_literal_booleans_before_numbers():
+    # bool is a subclass of int, True must not be written as 1
+    assert ODataUrl.literal(True) == "true"
+    assert ODataUrl.literal(False) == "false"
+    assert ODataUrl.literal(42) == "42"
+    assert ODataUrl.literal(2.5) == "2.5"
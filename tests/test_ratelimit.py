@@ -0,0 +1,73 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from redutils.api.ratelimit import RateLimiter
+
+
+def test_reserve_waits_once_the_burst_is_spent():
+    limiter = RateLimiter(rate=10, burst=2)
+
+    waits = [limiter.reserve() for _ in range(4)]
+
+    assert waits[:2] == [0.0, 0.0]
+    assert waits[2] == pytest.approx(0.1, abs=0.01)
+    assert waits[3] == pytest.approx(0.2, abs=0.01)
+    assert limiter.stats["requests"] == 4
+
+
+def test_acquire_sleeps_for_the_bucket():
+    limiter = RateLimiter(rate=20, burst=1)
+
+    start = time.monotonic()
+    for _ in range(3):
+        with limiter:
+            pass
+
+    assert 0.09 <= time.monotonic() - start < 0.5
+
+
+def test_max_in_flight_blocks_until_released():
+    limiter = RateLimiter(rate=1000, max_in_flight=1)
+    entered = threading.Event()
+
+    def call():
+        with limiter:
+            entered.set()
+
+    limiter.acquire()
+    worker = threading.Thread(target=call)
+    worker.start()
+
+    assert not entered.wait(0.1)
+    limiter.release()
+    assert entered.wait(1)
+    worker.join()
+
+
+def test_max_in_flight_bounds_asyncio_tasks():
+    limiter = RateLimiter(rate=1000, max_in_flight=2, poll_interval=0.001)
+    in_flight = 0
+    peak = 0
+
+    async def call():
+        nonlocal in_flight, peak
+        async with limiter:
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+
+    async def main():
+        await asyncio.gather(*(call() for _ in range(8)))
+
+    asyncio.run(main())
+
+    assert peak == 2
+
+
+def test_rate_must_be_positive():
+    with pytest.raises(ValueError):
+        RateLimiter(rate=0)
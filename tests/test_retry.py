@@ -0,0 +1,82 @@
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import pytest
+import requests
+
+from redutils.api.retry import RetryPolicy
+from redutils.auth.oauth import OAuthApi
+
+
+def test_delay_backs_off_exponentially_up_to_max_backoff():
+    policy = RetryPolicy(backoff=1.0, max_backoff=5.0, jitter=False)
+
+    assert [policy.delay(attempt) for attempt in range(5)] == [1, 2, 4, 5, 5]
+
+
+def test_delay_jitter_stays_within_backoff():
+    policy = RetryPolicy(backoff=1.0, max_backoff=5.0)
+
+    assert all(0 <= policy.delay(3) <= 5 for _ in range(100))
+
+
+def test_delay_honors_retry_after_up_to_max_retry_after():
+    policy = RetryPolicy(backoff=1.0, jitter=False, max_retry_after=30)
+
+    assert policy.delay(0, "12") == 12
+    assert policy.delay(0, "600") == 30
+
+
+@pytest.mark.parametrize(
+    "retry_after, expected",
+    [(None, None), ("", None), ("7", 7.0), ("1.5", 1.5), ("-3", 0.0), ("soon", None)],
+)
+def test_parse_retry_after_seconds(retry_after, expected):
+    assert RetryPolicy._parse_retry_after(retry_after) == expected
+
+
+def test_parse_retry_after_http_date():
+    when = datetime.now(timezone.utc) + timedelta(seconds=120)
+
+    seconds = RetryPolicy._parse_retry_after(format_datetime(when, usegmt=True))
+
+    assert 110 <= seconds <= 120
+
+
+def test_parse_retry_after_http_date_in_the_past():
+    when = datetime.now(timezone.utc) - timedelta(hours=1)
+
+    assert RetryPolicy._parse_retry_after(format_datetime(when, usegmt=True)) == 0.0
+
+
+class Source(OAuthApi):
+    def setup(self):
+        self.authorize_url = "https://example/token"
+        self.endpoint_url = "https://example/api/"
+
+
+def response(status, headers={}):
+    resp = requests.Response()
+    resp.status_code = status
+    resp.headers.update(headers)
+    resp._content = b"{}"
+    return resp
+
+
+def test_smart_call_retries_unavailable_then_succeeds(monkeypatch):
+    api = Source("client_id", "client_secret", retry_policy=RetryPolicy(backoff=0))
+    api._api_token = "token"
+    responses = [response(503, {"Retry-After": "0"}), response(200)]
+    calls = []
+
+    def get(url, **params):
+        calls.append(url)
+        return responses.pop(0)
+
+    monkeypatch.setattr(api._main_session, "get", get)
+
+    resp = api.smart_call(api._main_session.get, "https://example/api/workers")
+
+    assert resp.status_code == 200
+    assert len(calls) == 2
+    assert api.retry_policy.retries == 1
@@ -0,0 +1,35 @@
+from datetime import date, datetime, timedelta, timezone
+
+from redutils.api.templates import plan_windows
+
+
+def test_plan_windows_dates():
+    assert plan_windows(date(2024, 1, 1), date(2024, 1, 31), 3) == [
+        (date(2024, 1, 1), date(2024, 1, 11)),
+        (date(2024, 1, 11), date(2024, 1, 21)),
+        (date(2024, 1, 21), date(2024, 1, 31)),
+    ]
+
+
+def test_plan_windows_datetimes():
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+    windows = plan_windows(start, start + timedelta(hours=6), 4)
+
+    assert windows == [
+        (start + timedelta(minutes=90 * idx), start + timedelta(minutes=90 * (idx + 1)))
+        for idx in range(4)
+    ]
+
+
+def test_plan_windows_collapses_repeated_bounds():
+    # dates only move by whole days, two days cannot make five windows
+    assert plan_windows(date(2024, 1, 1), date(2024, 1, 3), 5) == [
+        (date(2024, 1, 1), date(2024, 1, 2)),
+        (date(2024, 1, 2), date(2024, 1, 3)),
+    ]
+
+
+def test_plan_windows_empty_range():
+    assert plan_windows(date(2024, 1, 1), date(2024, 1, 1), 3) == []
+    assert plan_windows(date(2024, 1, 2), date(2024, 1, 1), 3) == []
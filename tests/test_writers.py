@@ -0,0 +1,39 @@
+import math
+
+import pandas as pd
+import pyarrow.parquet as pq
+
+from redutils.api.writers import ChunkedFileWriter
+
+
+def test_parquet_column_empty_in_first_chunk(tmp_path):
+    path = tmp_path / "workers.parquet"
+    chunks = [
+        pd.DataFrame({"Id": [1, 2], "Owner_Name": [math.nan, math.nan]}),
+        pd.DataFrame({"Id": [3, 4], "Owner_Name": ["z", math.nan]}),
+    ]
+
+    with ChunkedFileWriter(path, "parquet") as writer:
+        for df in chunks:
+            writer.write(df)
+
+    table = pq.read_table(path)
+    assert writer.rows == 4
+    assert table.column("Owner_Name").to_pylist() == [None, None, "z", None]
+    assert table.column("Id").to_pylist() == [1, 2, 3, 4]
+
+
+def test_parquet_int_column_then_floats(tmp_path):
+    path = tmp_path / "ownerships.parquet"
+    chunks = [
+        pd.DataFrame({"Id": [1, 2], "OwnershipPercentage": [100, 50]}),
+        pd.DataFrame({"Id": [3, 4], "OwnershipPercentage": [33.5, 66.5]}),
+    ]
+
+    with ChunkedFileWriter(path, "parquet") as writer:
+        for df in chunks:
+            writer.write(df)
+
+    table = pq.read_table(path)
+    assert table.column("OwnershipPercentage").to_pylist() == [100, 50, 33.5, 66.5]
+    assert table.column("Id").to_pylist() == [1, 2, 3, 4]